@@ -3,6 +3,7 @@ Alembic Environment Configuration
 """
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config, pool
+from sqlalchemy.pool import NullPool
 from alembic import context
 import sys
 from pathlib import Path
@@ -58,8 +59,50 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def _get_engine(url: str):
+    """
+    Get (or lazily create) the migration engine for a database URL.
+
+    env.py is re-executed for every alembic command, so engines are cached
+    in config.attributes: callers that run several commands with the same
+    Config (e.g. upgrading many databases back-to-back) reuse them.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engines = config.attributes.setdefault("async_engines", {})
+    engine = engines.get(url)
+    if engine is None:
+        # Migrations use a single connection, so skip the queue pool entirely
+        engine = create_async_engine(url, poolclass=NullPool)
+        engines[url] = engine
+    return engine
+
+
+# SQLite settings applied for the migration run. journal_mode=WAL persists
+# in the database file; the rest only last for this connection.
+SQLITE_MIGRATION_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-65536",
+)
+
+
+def _tune_sqlite(connection) -> None:
+    """Avoid a full fsync per DDL statement / table rebuild on SQLite"""
+    if connection.dialect.name != "sqlite":
+        return
+
+    for pragma in SQLITE_MIGRATION_PRAGMAS:
+        connection.exec_driver_sql(f"PRAGMA {pragma}")
+
+    # End the autobegun transaction so alembic starts its own
+    connection.commit()
+
+
 def do_run_migrations(connection):
     """Run migrations with the given connection"""
+    _tune_sqlite(connection)
     context.configure(connection=connection, target_metadata=target_metadata)
 
     with context.begin_transaction():
@@ -73,19 +116,20 @@ def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
-    # For async support, use create_async_engine
-    from sqlalchemy.ext.asyncio import create_async_engine
-
     # Convert sync URL to async if needed
     url = config.get_main_option("sqlalchemy.url")
     if url and url.startswith("sqlite:///"):
         url = url.replace("sqlite:///", "sqlite+aiosqlite:///")
 
-    connectable = create_async_engine(url)
+    # dispose() only closes connections; the cached engine stays usable
+    connectable = _get_engine(url)
 
     async def run_async_migrations():
-        async with connectable.connect() as connection:
-            await connection.run_sync(do_run_migrations)
+        try:
+            async with connectable.connect() as connection:
+                await connection.run_sync(do_run_migrations)
+        finally:
+            await connectable.dispose()
 
     import asyncio
     asyncio.run(run_async_migrations())
@@ -23,28 +23,24 @@ depends_on = None
 def upgrade() -> None:
     """添加会话恢复字段"""
 
-    # 添加 engine_state 列
-    op.add_column(
-        'sessions',
-        sa.Column('engine_state', sa.JSON(), nullable=True)
-    )
+    # 在同一个 batch 中添加全部字段，SQLite 只需重建一次表
+    with op.batch_alter_table('sessions') as batch_op:
+        # 添加 engine_state 列
+        batch_op.add_column(sa.Column('engine_state', sa.JSON(), nullable=True))
 
-    # 添加 current_task_index 列
-    op.add_column(
-        'sessions',
-        sa.Column('current_task_index', sa.Integer(), nullable=True)
-    )
+        # 添加 current_task_index 列
+        batch_op.add_column(sa.Column('current_task_index', sa.Integer(), nullable=True))
 
-    # 添加 is_resumable 列，默认值为 True
-    op.add_column(
-        'sessions',
-        sa.Column('is_resumable', sa.Boolean(), nullable=False, server_default='1')
-    )
+        # 添加 is_resumable 列，默认值为 True
+        batch_op.add_column(
+            sa.Column('is_resumable', sa.Boolean(), nullable=False, server_default='1')
+        )
 
 
 def downgrade() -> None:
     """移除会话恢复字段"""
 
-    op.drop_column('sessions', 'is_resumable')
-    op.drop_column('sessions', 'current_task_index')
-    op.drop_column('sessions', 'engine_state')
+    with op.batch_alter_table('sessions') as batch_op:
+        batch_op.drop_column('is_resumable')
+        batch_op.drop_column('current_task_index')
+        batch_op.drop_column('engine_state')
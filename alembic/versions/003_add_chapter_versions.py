@@ -11,7 +11,9 @@ Create Date: 2026-01-29 00:00:00.000000
   - version_count: 版本总数
   - rewrite_status: 重写状态
 """
-from alembic import op
+import uuid
+
+from alembic import context, op
 import sqlalchemy as sa
 from sqlalchemy.dialects import sqlite
 
@@ -22,6 +24,12 @@ down_revision = '002'
 branch_labels = None
 depends_on = None
 
+# 回填时每页读取/写入的行数
+BACKFILL_BATCH_SIZE = 100
+
+# 需要回填版本的章节任务类型
+CHAPTER_TASK_TYPES = ('章节内容', '章节润色')
+
 
 def upgrade() -> None:
     """添加章节版本管理功能"""
@@ -50,8 +58,7 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id')
     )
 
-    # 2. 创建索引
-    op.create_index('ix_chapter_versions_session_id', 'chapter_versions', ['session_id'])
+    # 2. 创建索引（session_id 查询由复合索引前缀覆盖，无需单独索引）
     op.create_index('ix_chapter_versions_task_id', 'chapter_versions', ['task_id'])
     op.create_index('ix_chapter_versions_chapter_index', 'chapter_versions', ['chapter_index'])
     op.create_index(
@@ -59,35 +66,174 @@ def upgrade() -> None:
         'chapter_versions',
         ['session_id', 'chapter_index', 'version_number']
     )
+    # 部分索引：只索引当前版本，加速"获取章节当前版本"查询
+    op.create_index(
+        'ix_chapter_versions_current',
+        'chapter_versions',
+        ['session_id', 'chapter_index'],
+        sqlite_where=sa.text('is_current = 1')
+    )
+
+    # 3. 扩展 task_results 表，添加版本管理字段（同一 batch，SQLite 只重建一次表）
+    with op.batch_alter_table('task_results') as batch_op:
+        batch_op.add_column(sa.Column('current_version_id', sa.String(), nullable=True))
+        batch_op.add_column(
+            sa.Column('version_count', sa.Integer(), nullable=False, server_default='1')
+        )
+        batch_op.add_column(
+            sa.Column('rewrite_status', sa.String(), nullable=False, server_default='none')
+        )
 
-    # 3. 扩展 task_results 表，添加版本管理字段
-    op.add_column(
+    # 4. 将已有章节结果回填为版本历史
+    _backfill_chapter_versions()
+
+
+def _backfill_chapter_versions() -> None:
+    """
+    将已有的章节 task_results 回填为 chapter_versions 的版本
+
+    同一章节（session_id + chapter_index）可能有多条结果（章节内容、章节润色、
+    重复生成的章节内容），按 章节内容 → 章节润色、再按创建时间排序后依次编号
+    v1, v2, ...；每章只有编号最大的版本（即优先取最新的润色结果，与导出时的
+    选择一致）标记为当前版本。
+
+    分页读取（每页 BACKFILL_BATCH_SIZE 行），每页在独立的 autocommit 块中
+    批量写入，避免一次性加载全部章节内容或产生单个超大事务。
+    """
+    if context.is_offline_mode():
+        return
+
+    bind = op.get_bind()
+
+    task_results = sa.table(
         'task_results',
-        sa.Column('current_version_id', sa.String(), nullable=True)
+        sa.column('id', sa.String()),
+        sa.column('session_id', sa.String()),
+        sa.column('task_id', sa.String()),
+        sa.column('task_type', sa.String()),
+        sa.column('chapter_index', sa.Integer()),
+        sa.column('result', sa.Text()),
+        sa.column('evaluation', sa.JSON()),
+        sa.column('created_at', sa.DateTime()),
+        sa.column('current_version_id', sa.String()),
     )
-    op.add_column(
-        'task_results',
-        sa.Column('version_count', sa.Integer(), nullable=False, server_default='1')
+    chapter_versions = sa.table(
+        'chapter_versions',
+        sa.column('id', sa.String()),
+        sa.column('session_id', sa.String()),
+        sa.column('task_id', sa.String()),
+        sa.column('chapter_index', sa.Integer()),
+        sa.column('version_number', sa.Integer()),
+        sa.column('is_current', sa.Boolean()),
+        sa.column('content', sa.Text()),
+        sa.column('score', sa.Float()),
+        sa.column('quality_score', sa.Float()),
+        sa.column('consistency_score', sa.Float()),
+        sa.column('evaluation', sa.JSON()),
+        sa.column('created_by', sa.String()),
     )
-    op.add_column(
-        'task_results',
-        sa.Column('rewrite_status', sa.String(), nullable=False, server_default='none')
+
+    # 同一章节的行在排序中连续出现，跨页时靠 last_chapter 延续编号
+    polish_last = sa.case((task_results.c.task_type == '章节润色', 1), else_=0)
+    query = (
+        sa.select(
+            task_results.c.id,
+            task_results.c.session_id,
+            task_results.c.task_id,
+            task_results.c.chapter_index,
+            task_results.c.result,
+            task_results.c.evaluation,
+        )
+        .where(
+            task_results.c.chapter_index.isnot(None),
+            task_results.c.result.isnot(None),
+            task_results.c.task_type.in_(CHAPTER_TASK_TYPES),
+        )
+        .order_by(
+            task_results.c.session_id,
+            task_results.c.chapter_index,
+            polish_last,
+            task_results.c.created_at,
+            task_results.c.id,
+        )
     )
+    total = bind.execute(
+        sa.select(sa.func.count()).select_from(query.subquery())
+    ).scalar() or 0
+
+    link_current_version = (
+        task_results.update()
+        .where(task_results.c.id == sa.bindparam('row_id'))
+        .values(current_version_id=sa.bindparam('version_id'))
+    )
+
+    last_chapter = None
+    version_number = 0
+    for offset in range(0, total, BACKFILL_BATCH_SIZE):
+        rows = bind.execute(query.limit(BACKFILL_BATCH_SIZE).offset(offset)).fetchall()
+        if not rows:
+            break
+
+        versions = []
+        links = []
+        for row in rows:
+            chapter = (row.session_id, row.chapter_index)
+            version_number = version_number + 1 if chapter == last_chapter else 1
+            last_chapter = chapter
+
+            evaluation = row.evaluation or {}
+            version_id = str(uuid.uuid4())
+            versions.append({
+                'id': version_id,
+                'session_id': row.session_id,
+                'task_id': row.task_id,
+                'chapter_index': row.chapter_index,
+                'version_number': version_number,
+                'is_current': False,
+                'content': row.result,
+                'score': evaluation.get('score'),
+                'quality_score': evaluation.get('quality_score'),
+                'consistency_score': evaluation.get('consistency_score'),
+                'evaluation': row.evaluation,
+                'created_by': 'auto',
+            })
+            links.append({'row_id': row.id, 'version_id': version_id})
+
+        with op.get_context().autocommit_block():
+            op.bulk_insert(chapter_versions, versions)
+            bind.execute(link_current_version, links)
+
+    # 每章编号最大的版本为当前版本
+    latest = sa.table(
+        'chapter_versions',
+        sa.column('session_id', sa.String()),
+        sa.column('chapter_index', sa.Integer()),
+        sa.column('version_number', sa.Integer()),
+    ).alias('latest')
+    max_version = (
+        sa.select(sa.func.max(latest.c.version_number))
+        .where(
+            latest.c.session_id == chapter_versions.c.session_id,
+            latest.c.chapter_index == chapter_versions.c.chapter_index,
+        )
+        .scalar_subquery()
+    )
+    with op.get_context().autocommit_block():
+        bind.execute(
+            chapter_versions.update()
+            .where(chapter_versions.c.version_number == max_version)
+            .values(is_current=True)
+        )
 
 
 def downgrade() -> None:
     """移除章节版本管理功能"""
 
     # 1. 移除 task_results 扩展字段
-    op.drop_column('task_results', 'rewrite_status')
-    op.drop_column('task_results', 'version_count')
-    op.drop_column('task_results', 'current_version_id')
-
-    # 2. 删除索引
-    op.drop_index('ix_chapter_versions_session_chapter_version', table_name='chapter_versions')
-    op.drop_index('ix_chapter_versions_chapter_index', table_name='chapter_versions')
-    op.drop_index('ix_chapter_versions_task_id', table_name='chapter_versions')
-    op.drop_index('ix_chapter_versions_session_id', table_name='chapter_versions')
+    with op.batch_alter_table('task_results') as batch_op:
+        batch_op.drop_column('rewrite_status')
+        batch_op.drop_column('version_count')
+        batch_op.drop_column('current_version_id')
 
-    # 3. 删除 chapter_versions 表
+    # 2. 删除 chapter_versions 表（DROP TABLE 会一并删除其全部索引）
     op.drop_table('chapter_versions')
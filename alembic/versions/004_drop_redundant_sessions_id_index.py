@@ -0,0 +1,28 @@
+"""Drop redundant sessions id index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-02-05 00:00:00.000000
+
+删除 sessions 表上多余的 ix_sessions_id 索引：
+- id 是主键，已有唯一索引，ix_sessions_id 只会增加写入开销
+- ORM 模型未声明该索引，按模型建表的数据库本就没有它，因此使用 IF EXISTS
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """删除多余的主键索引"""
+    op.drop_index(op.f('ix_sessions_id'), table_name='sessions', if_exists=True)
+
+
+def downgrade() -> None:
+    """恢复 001 创建的索引"""
+    op.create_index(op.f('ix_sessions_id'), 'sessions', ['id'], unique=False, if_not_exists=True)
@@ -5,10 +5,39 @@
 该 collection 可能包含来自不同会话的混合数据。
 """
 
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 from loguru import logger
 
+DEFAULT_COLLECTION_NAME = "creative_autogpt"
+
+
+def _collection_exists(persist_directory: str, name: str) -> Optional[bool]:
+    """
+    直接查询 Chroma 的 sqlite 元数据判断 collection 是否存在
+
+    比创建 PersistentClient 轻量得多。无法判断时（如元数据结构变化）返回 None。
+    """
+    db_path = Path(persist_directory) / "chroma.sqlite3"
+    if not db_path.exists():
+        return False
+
+    try:
+        con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = con.execute("SELECT 1 FROM collections WHERE name = ?", (name,)).fetchone()
+        finally:
+            con.close()
+    except sqlite3.Error as e:
+        logger.debug(f"无法读取 Chroma 元数据，回退到客户端检查: {e}")
+        return None
+
+    return row is not None
+
 
 def clean_default_collection(persist_directory: str = "./data/chroma"):
     """
@@ -17,6 +46,13 @@ def clean_default_collection(persist_directory: str = "./data/chroma"):
     Args:
         persist_directory: ChromaDB 持久化目录
     """
+    default_collection_name = DEFAULT_COLLECTION_NAME
+
+    # 先通过 sqlite 元数据快速检查，不存在时无需加载 Chroma 客户端
+    if _collection_exists(persist_directory, default_collection_name) is False:
+        logger.info(f"✓ 默认 collection '{default_collection_name}' 不存在，无需清理")
+        return
+
     # 初始化 ChromaDB 客户端
     client = chromadb.PersistentClient(
         path=persist_directory,
@@ -26,40 +62,34 @@ def clean_default_collection(persist_directory: str = "./data/chroma"):
         ),
     )
 
-    # 获取所有 collections
-    collections = client.list_collections()
+    # 获取所有 collections 及其数据条数（只查询一次，后续在内存中过滤）
+    counts = {coll.name: coll.count() for coll in client.list_collections()}
 
-    logger.info(f"当前共有 {len(collections)} 个 collections:")
+    logger.info(f"当前共有 {len(counts)} 个 collections:")
 
-    for coll in collections:
-        count = coll.count()
-        logger.info(f"  - {coll.name}: {count} 条数据")
+    for name, count in counts.items():
+        logger.info(f"  - {name}: {count} 条数据")
 
     # 查找并删除默认 collection
-    default_collection_name = "creative_autogpt"
+    if default_collection_name not in counts:
+        logger.info(f"✓ 默认 collection 不存在或已被删除")
+        return
 
-    try:
-        # 尝试获取默认 collection
-        default_collection = client.get_collection(name=default_collection_name)
-
-        count = default_collection.count()
-        logger.warning(f"⚠️ 发现默认 collection '{default_collection_name}'，包含 {count} 条数据")
-        logger.warning("这些数据可能是由于 session_id 未正确传递而导致的跨会话污染")
+    count = counts.pop(default_collection_name)
+    logger.warning(f"⚠️ 发现默认 collection '{default_collection_name}'，包含 {count} 条数据")
+    logger.warning("这些数据可能是由于 session_id 未正确传递而导致的跨会话污染")
 
-        # 删除 collection
+    try:
         client.delete_collection(name=default_collection_name)
         logger.success(f"✅ 已成功删除默认 collection '{default_collection_name}'")
-
     except Exception as e:
         logger.info(f"✓ 默认 collection 不存在或已被删除: {e}")
 
-    # 验证删除结果
-    collections_after = client.list_collections()
-    logger.info(f"\n清理后剩余 {len(collections_after)} 个 collections:")
+    # 删除结果直接由内存中的列表得出，无需再次查询
+    logger.info(f"\n清理后剩余 {len(counts)} 个 collections:")
 
-    for coll in collections_after:
-        count = coll.count()
-        logger.info(f"  - {coll.name}: {count} 条数据")
+    for name, count in counts.items():
+        logger.info(f"  - {name}: {count} 条数据")
 
 
 if __name__ == "__main__":
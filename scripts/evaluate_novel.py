@@ -11,19 +11,98 @@
 
 import asyncio
 import json
+import mmap
 import os
+import re
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 from enum import Enum
 
+import aiofiles
 import httpx
 from rich.console import Console
+from rich.cells import cell_len
 from rich.panel import Panel
-from rich.table import Table
 
 console = Console()
 
+# 评估提示词模板路径
+PROMPT_PATH = Path(__file__).parent / "novel_evaluator_prompt.md"
+
+# Qwen API 限制输入长度为 30720 tokens
+# 中文约 1-2 字符/token，提示词模板约 1000 字符
+# 保守估计，限制内容在 15000 字符以内
+MAX_NOVEL_CHARS = 15000
+
+# 智能采样时开头、中间、结尾各取的字符数
+SAMPLE_WINDOW_CHARS = 5000
+
+SAMPLE_SEPARATOR = "\n\n... [部分内容省略] ...\n\n"
+
+# UTF-8 单个字符最多占用的字节数
+_UTF8_MAX_BYTES = 4
+
+# 错误响应最多读取的字节数
+MAX_ERROR_BODY_BYTES = 4096
+
+# 评分表格行：| 维度 | 8.5/10 | 简评 |
+_SCORE_TABLE_RE = re.compile(r'\|\s*([^|]+)\s*\|\s*(\d+(?:\.\d+)?)/10\s*\|\s*([^|]+)\s*\|')
+
+# 已加载的提示词模板缓存（模板为静态文件，只需读取一次）
+_prompt_cache: dict[str, str] = {}
+
+
+async def _read_text(path: Path) -> str:
+    """异步读取文本文件"""
+    async with aiofiles.open(path, 'r', encoding='utf-8') as f:
+        return await f.read()
+
+
+def _read_novel(path: Path) -> tuple[str, bool]:
+    """
+    读取小说内容，过长时进行智能采样（取开头、中间和结尾）
+
+    较小的文件直接整体读取；大文件通过 mmap 只解码三个采样窗口，
+    内存占用和解码量不随文件大小增长。
+
+    Returns:
+        (小说内容, 是否经过采样)
+    """
+    size = path.stat().st_size
+
+    if size <= MAX_NOVEL_CHARS * _UTF8_MAX_BYTES:
+        content = path.read_text(encoding='utf-8')
+        if len(content) <= MAX_NOVEL_CHARS:
+            return content, False
+
+        quarter = len(content) // 4
+        return SAMPLE_SEPARATOR.join([
+            content[:SAMPLE_WINDOW_CHARS],  # 开篇
+            content[quarter:quarter + SAMPLE_WINDOW_CHARS],  # 中间
+            content[-SAMPLE_WINDOW_CHARS:],  # 结尾
+        ]), True
+
+    # 窗口边界可能截断多字节字符，errors='ignore' 丢弃残缺字节后再按字符数截取
+    window = SAMPLE_WINDOW_CHARS * _UTF8_MAX_BYTES
+    quarter = size // 4
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        head = mm[:window].decode('utf-8', errors='ignore')[:SAMPLE_WINDOW_CHARS]
+        middle = mm[quarter:quarter + window].decode('utf-8', errors='ignore')[:SAMPLE_WINDOW_CHARS]
+        tail = mm[-window:].decode('utf-8', errors='ignore')[-SAMPLE_WINDOW_CHARS:]
+
+    return SAMPLE_SEPARATOR.join([head, middle, tail]), True
+
+
+async def _load_prompt(path: Path = PROMPT_PATH) -> str:
+    """读取提示词模板，同一路径只读取一次"""
+    key = str(path)
+    template = _prompt_cache.get(key)
+    if template is None:
+        template = await _read_text(path)
+        _prompt_cache[key] = template
+    return template
+
 
 class LLMProvider(Enum):
     """LLM 提供商"""
@@ -43,6 +122,19 @@ class NovelEvaluator:
         """
         self.provider = provider
         self.base_url = self._get_base_url(provider)
+        self.api_key = self._get_api_key(provider)
+        self.model = self._get_model(provider)
+
+        # 复用同一个连接池，避免每次评估都重新建立 TCP/TLS 连接
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(300.0, connect=10.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+
+    async def aclose(self) -> None:
+        """关闭 HTTP 连接池"""
+        await self._client.aclose()
 
     def _get_base_url(self, provider: str) -> str:
         """获取 API 基础 URL"""
@@ -95,34 +187,21 @@ class NovelEvaluator:
             console.print(f"[red]❌ 小说文件不存在: {novel_path}[/red]")
             return {}
 
-        with open(novel_path, 'r', encoding='utf-8') as f:
-            novel_content = f.read()
+        # 小说、提示词模板和输出目录互不依赖，并发准备
+        output_dir = Path(output_dir)
+        (novel_content, sampled), prompt_template, _ = await asyncio.gather(
+            asyncio.to_thread(_read_novel, novel_path),
+            _load_prompt(),
+            asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True),
+        )
 
         # 智能采样：如果内容太长，只评估关键部分
-        content_length = len(novel_content)
-        console.print(f"[dim]📏 小说内容长度: {content_length:,} 字符[/dim]")
-
-        # Qwen API 限制输入长度为 30720 tokens
-        # 中文约 1-2 字符/token，提示词模板约 1000 字符
-        # 保守估计，限制内容在 15000 字符以内
-        max_chars = 15000
-        if content_length > max_chars:
-            console.print(f"[yellow]⚠️  内容过长，将进行智能采样...[/yellow]")
-            # 智能采样策略：取开头、中间和结尾
-            quarter = content_length // 4
-            novel_content = (
-                novel_content[:5000] +  # 前 5000 字符（开篇）
-                "\n\n... [部分内容省略] ...\n\n" +
-                novel_content[quarter:quarter+5000] +  # 中间 5000 字符
-                "\n\n... [部分内容省略] ...\n\n" +
-                novel_content[-5000:]  # 最后 5000 字符（结尾）
-            )
+        if sampled:
+            console.print(f"[dim]📏 小说文件大小: {novel_path.stat().st_size:,} 字节[/dim]")
+            console.print(f"[yellow]⚠️  内容过长，已进行智能采样...[/yellow]")
             console.print(f"[dim]✂️  采样后长度: {len(novel_content):,} 字符[/dim]")
-
-        # 读取评估提示词
-        prompt_path = Path(__file__).parent / "novel_evaluator_prompt.md"
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            prompt_template = f.read()
+        else:
+            console.print(f"[dim]📏 小说内容长度: {len(novel_content):,} 字符[/dim]")
 
         # 2. 构建完整提示词
         console.print("[dim]📝 构建评估提示词...[/dim]")
@@ -135,17 +214,11 @@ class NovelEvaluator:
         console.print(f"[dim]🤖 调用 {self.provider} 进行评估...[/dim]")
         console.print("[dim]这可能需要 1-2 分钟，请耐心等待...[/dim]")
 
-        evaluation = await self._call_llm(full_prompt)
-
-        # 4. 保存评估报告
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
+        # 4. 流式接收评估结果，边接收边写入评估报告
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_path = output_dir / f"evaluation_{timestamp}.md"
 
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(evaluation)
+        evaluation = await self._call_llm(full_prompt, report_path)
 
         console.print(f"[green]✅ 评估报告已保存: {report_path}[/green]")
 
@@ -161,19 +234,27 @@ class NovelEvaluator:
             "scores": scores
         }
 
-    async def _call_llm(self, prompt: str) -> str:
-        """调用 LLM API"""
-        api_key = self._get_api_key(self.provider)
-        if not api_key:
+    async def _call_llm(self, prompt: str, report_path: Path) -> str:
+        """
+        以流式方式调用 LLM API
+
+        Args:
+            prompt: 完整提示词
+            report_path: 评估报告路径，接收到的内容会增量写入
+
+        Returns:
+            完整的评估内容
+        """
+        if not self.api_key:
             raise ValueError(f"API key not found for {self.provider}")
 
         headers = {
-            "Authorization": f"Bearer {api_key}",
+            "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
 
         payload = {
-            "model": self._get_model(self.provider),
+            "model": self.model,
             "messages": [
                 {
                     "role": "system",
@@ -185,35 +266,57 @@ class NovelEvaluator:
                 }
             ],
             "temperature": 0.3,  # 降低温度以获得更稳定的评估
-            "max_tokens": 8000
+            "max_tokens": 8000,
+            "stream": True
         }
 
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload
-            )
+        chunks: list[str] = []
 
+        async with self._client.stream(
+            "POST",
+            "/chat/completions",
+            headers=headers,
+            json=payload
+        ) as response:
             # 打印错误详情用于调试
             if response.status_code != 200:
                 console.print(f"[red]❌ API 请求失败: {response.status_code}[/red]")
+                # 只读取一次且限制大小，避免异常的超大错误响应
+                body = b""
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= MAX_ERROR_BODY_BYTES:
+                        break
+                body = body[:MAX_ERROR_BODY_BYTES]
                 try:
-                    error_detail = response.json()
+                    error_detail = json.loads(body)
                     console.print(f"[red]错误详情: {error_detail}[/red]")
-                except:
-                    console.print(f"[red]错误详情: {response.text[:500]}[/red]")
+                except ValueError:
+                    console.print(f"[red]错误详情: {body[:500].decode('utf-8', errors='replace')}[/red]")
                 console.print(f"[dim]提示词长度: {len(prompt)} 字符[/dim]")
 
             response.raise_for_status()
-            result = response.json()
 
-            return result["choices"][0]["message"]["content"]
+            async with aiofiles.open(report_path, 'w', encoding='utf-8') as f:
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[6:]
+                    if data.strip() == "[DONE]":
+                        break
+
+                    choices = json.loads(data).get("choices") or []
+                    if not choices:
+                        continue
+                    delta = choices[0].get("delta", {}).get("content") or ""
+                    if delta:
+                        chunks.append(delta)
+                        await f.write(delta)
+
+        return "".join(chunks)
 
     def _parse_scores(self, evaluation: str) -> dict:
         """解析评估报告中的评分"""
-        import re
-
         scores = {
             "核心创意": 0,
             "人物塑造": 0,
@@ -223,8 +326,7 @@ class NovelEvaluator:
         }
 
         # 查找评分表格
-        table_pattern = r'\|\s*([^|]+)\s*\|\s*(\d+(?:\.\d+)?)/10\s*\|\s*([^|]+)\s*\|'
-        for match in re.finditer(table_pattern, evaluation):
+        for match in _SCORE_TABLE_RE.finditer(evaluation):
             dimension = match.group(1).strip()
             score_str = match.group(2)
             comment = match.group(3).strip()
@@ -239,11 +341,6 @@ class NovelEvaluator:
 
     def _display_scores(self, scores: dict):
         """显示评分概览"""
-        table = Table(title="📊 评分概览", show_header=True, header_style="bold magenta")
-        table.add_column("维度", style="cyan", width=20)
-        table.add_column("评分", justify="right", style="yellow")
-        table.add_column("评级", style="green")
-        table.add_column("简评", style="dim")
 
         def get_grade(score: float) -> str:
             """根据评分返回等级"""
@@ -258,18 +355,32 @@ class NovelEvaluator:
             else:
                 return "⚠️ 需改进"
 
-        for dimension, score in scores.items():
-            grade = get_grade(score)
-
-            table.add_row(
-                dimension,
-                f"{score:.1f}/10",
-                grade,
-                "见详细报告"
-            )
+        def pad(text: str, width: int, right: bool = False) -> str:
+            """按终端显示宽度补齐（中文和 emoji 占两列）"""
+            fill = " " * (width - cell_len(text))
+            return fill + text if right else text + fill
+
+        # 固定的小表格直接格式化为文本，一次输出，省去 rich.Table 的布局计算
+        header = ("维度", "评分", "评级", "简评")
+        rows = [
+            (dimension, f"{score:.1f}/10", get_grade(score), "见详细报告")
+            for dimension, score in scores.items()
+        ]
+        widths = [max(cell_len(row[i]) for row in [header, *rows]) for i in range(3)]
+
+        lines = [
+            "📊 评分概览",
+            "  ".join([pad(header[0], widths[0]), pad(header[1], widths[1], right=True),
+                       pad(header[2], widths[2]), header[3]]),
+        ]
+        lines.extend(
+            "  ".join([pad(dimension, widths[0]), pad(score, widths[1], right=True),
+                       pad(grade, widths[2]), note])
+            for dimension, score, grade, note in rows
+        )
 
         console.print("\n")
-        console.print(table)
+        console.print("\n".join(lines), markup=False, highlight=False)
 
         # 计算平均分
         avg_score = sum(scores.values()) / len(scores) if scores else 0
@@ -316,6 +427,9 @@ async def main():
         import traceback
         console.print(traceback.format_exc())
 
+    finally:
+        await evaluator.aclose()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -20,16 +20,16 @@ async def init_database():
 
     logger.info("Initializing database...")
 
-    # Initialize session storage
+    # Session storage (SQLite) and vector store (Chroma) are independent,
+    # so initialize them concurrently. Chroma's client is synchronous.
     storage = SessionStorage()
-    await storage.initialize()
+    vector_store = VectorStore()
+    _, count = await asyncio.gather(
+        storage.initialize(),
+        asyncio.to_thread(vector_store.count),
+    )
 
     logger.info("Database initialized successfully")
-
-    # Test vector store
-    logger.info("Testing vector store...")
-    vector_store = VectorStore()
-    count = vector_store.count()
     logger.info(f"Vector store initialized (current items: {count})")
 
 
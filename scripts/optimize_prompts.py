@@ -14,11 +14,35 @@ import json
 from pathlib import Path
 from typing import Dict, List, Optional
 from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a project dependency
+    orjson = None
 
 console = Console()
 
+# 评估报告解析用的正则（模块加载时编译一次）
+_FATAL_RE = re.compile(r'## 二、致命问题.*?(?=## 三、|$)', re.DOTALL)
+_MINOR_RE = re.compile(r'## 三、次要问题.*?(?=## 四、|$)', re.DOTALL)
+_PROBLEM_TITLE_RE = re.compile(r'### 问题\d+：(.+)')
+
+# "提示词改进建议" 章节内的小节标题到计划字段的映射（None 表示该小节不收集）
+_PROMPT_SECTION_HEADER = "## 五、提示词改进建议"
+_PROMPT_SUBSECTIONS = {
+    "### 需要优化的任务类型": "prompt_improvements",
+    "### 提示词优化方向": "workflow_changes",
+    "### 流程优化建议": None,
+}
+
+# 问题块中的字段标签（"- **位置**：..."）到字段名的映射
+_ISSUE_FIELDS = {
+    "位置": "location",
+    "问题描述": "description",
+    "严重程度": "level",
+    "修复建议": "fix_suggestion",
+}
+
 
 class PromptOptimizer:
     """提示词优化器"""
@@ -47,21 +71,13 @@ class PromptOptimizer:
         issues = []
 
         # 提取致命问题
-        fatal_match = re.search(
-            r'## 二、致命问题.*?(?=## 三、|$)',
-            self.evaluation,
-            re.DOTALL
-        )
+        fatal_match = _FATAL_RE.search(self.evaluation)
         if fatal_match:
             fatal_issues = self._parse_issues_section(fatal_match.group(), "fatal")
             issues.extend(fatal_issues)
 
         # 提取次要问题
-        minor_match = re.search(
-            r'## 三、次要问题.*?(?=## 四、|$)',
-            self.evaluation,
-            re.DOTALL
-        )
+        minor_match = _MINOR_RE.search(self.evaluation)
         if minor_match:
             minor_issues = self._parse_issues_section(minor_match.group(), "minor")
             issues.extend(minor_issues)
@@ -69,33 +85,75 @@ class PromptOptimizer:
         return issues
 
     def _parse_issues_section(self, section: str, severity: str) -> List[Dict]:
-        """解析问题区块"""
+        """
+        解析问题区块
+
+        逐行单遍扫描：遇到 "### 问题N：" 开始新问题，遇到其他 "##" 标题结束当前问题；
+        "修复建议" 之后的所有行（支持多行内容）都归入修复建议。
+        """
         issues = []
+        current = None
+
+        for line in section.split('\n'):
+            if line.startswith('##'):
+                self._append_issue(issues, current, severity)
+                title_match = _PROBLEM_TITLE_RE.match(line)
+                current = {"title": title_match.group(1).strip()} if title_match else None
+                continue
+
+            if current is None:
+                continue
 
-        # 匹配问题块 - 支持多行内容
-        problem_pattern = r'### 问题\d+：([^\n]+)\n(?:-\s*\*\*位置\*\*：([^\n]+)\n)?(?:-\s*\*\*问题描述\*\*：([^\n]+)\n)?(?:-\s*\*\*严重程度\*\*：([^\n]+)\n)?(?:-\s*\*\*修复建议\*\*：(.*?))(?=### 问题\d+|##|\Z)'
-
-        for match in re.finditer(problem_pattern, section, re.DOTALL):
-            # 清理多行文本
-            fix_suggestion = match.group(5).strip() if match.group(5) else ""
-            # 移除过多的换行符和空格
-            fix_suggestion = re.sub(r'\s+', ' ', fix_suggestion)
-            # 限制长度
-            if len(fix_suggestion) > 500:
-                fix_suggestion = fix_suggestion[:500] + "..."
-
-            issues.append({
-                "title": match.group(1).strip(),
-                "location": match.group(2).strip() if match.group(2) else "未指定",
-                "description": match.group(3).strip() if match.group(3) else "",
-                "severity": severity,
-                "fix_suggestion": fix_suggestion
-            })
+            if "fix_lines" in current:
+                current["fix_lines"].append(line)
+                continue
 
+            field, value = self._parse_field_line(line)
+            if field == "fix_suggestion":
+                current["fix_lines"] = [value]
+            elif field:
+                current[field] = value.strip()
+
+        self._append_issue(issues, current, severity)
         return issues
 
+    @staticmethod
+    def _parse_field_line(line: str) -> tuple:
+        """解析 "- **字段**：值" 格式的行，返回 (字段名, 值)，不匹配时返回 (None, "")"""
+        stripped = line.lstrip()
+        if not stripped.startswith('-'):
+            return None, ""
+
+        label, sep, value = stripped[1:].lstrip().partition('：')
+        if not sep or not (label.startswith('**') and label.endswith('**')):
+            return None, ""
+
+        return _ISSUE_FIELDS.get(label[2:-2]), value
+
+    @staticmethod
+    def _append_issue(issues: List[Dict], current: Optional[Dict], severity: str) -> None:
+        """将解析完成的问题加入列表（缺少修复建议的问题会被忽略）"""
+        if not current or "fix_lines" not in current:
+            return
+
+        # 清理多行文本：移除过多的换行符和空格
+        fix_suggestion = ' '.join('\n'.join(current["fix_lines"]).split())
+        # 限制长度
+        if len(fix_suggestion) > 500:
+            fix_suggestion = fix_suggestion[:500] + "..."
+
+        issues.append({
+            "title": current["title"],
+            "location": current.get("location") or "未指定",
+            "description": current.get("description", ""),
+            "severity": severity,
+            "fix_suggestion": fix_suggestion
+        })
+
     def generate_improvement_plan(self) -> Dict:
         """生成改进计划"""
+        from rich.panel import Panel
+
         console.print(Panel.fit("[bold yellow]📋 生成改进计划[/bold yellow]"))
 
         plan = {
@@ -111,38 +169,24 @@ class PromptOptimizer:
                     "suggestion": issue["fix_suggestion"]
                 })
 
-        # 提取提示词改进建议
-        prompt_match = re.search(
-            r'## 五、提示词改进建议.*$',
-            self.evaluation,
-            re.DOTALL
-        )
-        if prompt_match:
-            prompt_section = prompt_match.group()
-
-            # 提取需要优化的任务类型
-            task_match = re.search(
-                r'### 需要优化的任务类型(.*?)(?=### 提示词优化方向|$)',
-                prompt_section,
-                re.DOTALL
-            )
-            if task_match:
-                task_text = task_match.group(1)
-                for line in task_text.split('\n'):
-                    if line.strip().startswith('1.') or line.strip().startswith('2.'):
-                        plan["prompt_improvements"].append(line.strip())
-
-            # 提取优化方向
-            direction_match = re.search(
-                r'### 提示词优化方向(.*?)(?=### 流程优化建议|$)',
-                prompt_section,
-                re.DOTALL
-            )
-            if direction_match:
-                direction_text = direction_match.group(1)
-                for line in direction_text.split('\n'):
-                    if line.strip().startswith('-'):
-                        plan["workflow_changes"].append(line.strip())
+        # 提取提示词改进建议：单遍扫描，按当前所在小节把行分发到对应列表
+        in_prompt_section = False
+        current = None
+        for line in self.evaluation.split('\n'):
+            if not in_prompt_section:
+                in_prompt_section = line.startswith(_PROMPT_SECTION_HEADER)
+                continue
+
+            header = next((h for h in _PROMPT_SUBSECTIONS if line.startswith(h)), None)
+            if header:
+                current = _PROMPT_SUBSECTIONS[header]
+                continue
+
+            line = line.strip()
+            if current == "prompt_improvements" and line.startswith(('1.', '2.')):
+                plan[current].append(line)
+            elif current == "workflow_changes" and line.startswith('-'):
+                plan[current].append(line)
 
         return plan
 
@@ -168,8 +212,11 @@ class PromptOptimizer:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(plan, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(plan, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(plan, f, ensure_ascii=False, indent=2)
 
         console.print(f"[green]✅ 改进计划已保存: {output_path}[/green]")
 
@@ -1,6 +1,7 @@
 """
 Quick test without full dependencies - validates core structure
 """
+import os
 import sys
 from pathlib import Path
 
@@ -58,6 +59,32 @@ def test_imports():
         return False
 
 
+def _list_dir(directory: Path, cache: dict) -> dict:
+    """List a directory once via scandir, returning {name: DirEntry} ({} if missing)"""
+    entries = cache.get(directory)
+    if entries is None:
+        try:
+            with os.scandir(directory) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}
+        cache[directory] = entries
+    return entries
+
+
+def _check_paths(base_path: Path, paths: list, is_dir: bool, cache: dict) -> None:
+    """Report each path as present or missing using cached directory listings"""
+    for rel_path in paths:
+        full_path = base_path / rel_path
+        entry = _list_dir(full_path.parent, cache).get(full_path.name)
+        # DirEntry reuses the dirent type, so no extra stat per path
+        present = entry is not None and (entry.is_dir() if is_dir else entry.is_file())
+        if present:
+            print(f"  ✓ {rel_path}")
+        else:
+            print(f"  ✗ {rel_path} (missing)")
+
+
 def test_structure():
     """Test project structure"""
     print("\nTesting project structure...")
@@ -76,13 +103,9 @@ def test_structure():
     ]
 
     base_path = Path(__file__).parent.parent
+    listing_cache = {}
 
-    for dir_path in required_dirs:
-        full_path = base_path / dir_path
-        if full_path.exists():
-            print(f"  ✓ {dir_path}")
-        else:
-            print(f"  ✗ {dir_path} (missing)")
+    _check_paths(base_path, required_dirs, is_dir=True, cache=listing_cache)
 
     required_files = [
         "requirements.txt",
@@ -96,12 +119,7 @@ def test_structure():
         "scripts/run_server.py",
     ]
 
-    for file_path in required_files:
-        full_path = base_path / file_path
-        if full_path.exists():
-            print(f"  ✓ {file_path}")
-        else:
-            print(f"  ✗ {file_path} (missing)")
+    _check_paths(base_path, required_files, is_dir=False, cache=listing_cache)
 
 
 def main():
@@ -6,6 +6,8 @@
 """
 
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 # Unicode emoji 范围（更精确）
@@ -23,6 +25,12 @@ EMOJI_PATTERN = re.compile(
     flags=re.UNICODE
 )
 
+# EMOJI_PATTERN 覆盖的字符都 >= U+24C2，其 UTF-8 编码首字节都 >= 0xE2
+_EMOJI_MIN_LEAD_BYTE = 0xE2
+
+# 清理用正则（编译一次，所有文件复用）
+_MULTISPACE_RE = re.compile(r'  +')
+
 
 def remove_emojis_from_file(file_path: Path, base_path: Path) -> int:
     """
@@ -36,35 +44,34 @@ def remove_emojis_from_file(file_path: Path, base_path: Path) -> int:
         int: 移除的 emoji 数量
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        data = file_path.read_bytes()
 
+        # 字节级预筛选：不含可能的 emoji 首字节的文件直接跳过，无需解码和处理
+        if not data or max(data) < _EMOJI_MIN_LEAD_BYTE:
+            return 0
+
+        content = data.decode('utf-8')
         original_content = content
 
         # 只移除 emoji，保留所有其他字符（包括中文）
         content = EMOJI_PATTERN.sub('', content)
 
         # 清理多余的空格（但不影响中文）
-        content = re.sub(r'  +', ' ', content)  # 多个空格变成一个
+        content = _MULTISPACE_RE.sub(' ', content)  # 多个空格变成一个
 
-        removed_count = len(original_content) - len(content)
+        if content == original_content:
+            return 0
 
-        if removed_count > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            try:
-                rel_path = file_path.relative_to(base_path)
-            except ValueError:
-                rel_path = file_path
-            print(f"[OK] {rel_path}: 移除了 {removed_count} 个字符")
+        file_path.write_text(content, encoding='utf-8')
+
+        removed_count = len(original_content) - len(content)
+        rel_path = file_path.relative_to(base_path) if base_path in file_path.parents else file_path
+        print(f"[OK] {rel_path}: 移除了 {removed_count} 个字符")
 
         return removed_count
 
     except Exception as e:
-        try:
-            rel_path = file_path.relative_to(base_path)
-        except ValueError:
-            rel_path = file_path
+        rel_path = file_path.relative_to(base_path) if base_path in file_path.parents else file_path
         print(f"[ERROR] {rel_path}: {e}")
         return 0
 
@@ -79,14 +86,17 @@ def main():
         print(f"错误: 找不到 {src_dir} 目录")
         return
 
-    total_removed = 0
-    file_count = 0
-
-    for py_file in src_dir.rglob("*.py"):
-        removed = remove_emojis_from_file(py_file, project_root)
-        total_removed += removed
-        if removed > 0:
-            file_count += 1
+    # 各文件互不依赖，用多进程并行处理
+    files = list(src_dir.rglob("*.py"))
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(
+            partial(remove_emojis_from_file, base_path=project_root),
+            files,
+            chunksize=32,
+        ))
+
+    total_removed = sum(results)
+    file_count = sum(1 for removed in results if removed > 0)
 
     print(f"\n总计: 从 {file_count} 个文件中移除了约 {total_removed} 个字符")
 
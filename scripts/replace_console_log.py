@@ -6,8 +6,27 @@
 """
 
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+# console.log/warn/error/info( -> logger.debug/warn/error/info(
+_CONSOLE_RE = re.compile(r'console\.(log|warn|error|info)\(')
+_CONSOLE_TO_LOGGER = {
+    'log': 'debug',
+    'warn': 'warn',
+    'error': 'error',
+    'info': 'info',
+}
+
+_IMPORT_RE = re.compile(r"^import .+;$", re.MULTILINE)
+_LOGGER_IMPORT = "\nimport logger from '@/utils/logger';"
+
+
+def _console_to_logger(match: re.Match) -> str:
+    """将匹配到的 console 调用映射为对应的 logger 调用"""
+    return f"logger.{_CONSOLE_TO_LOGGER[match.group(1)]}("
+
 
 def replace_console_in_file(file_path: Path, base_path: Path) -> int:
     """
@@ -21,60 +40,42 @@ def replace_console_in_file(file_path: Path, base_path: Path) -> int:
         int: 替换的数量
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if file_path.stat().st_size == 0:
+            return 0
+
+        content = file_path.read_text(encoding='utf-8')
+
+        # 大多数文件不含 console 调用，用子串检查先行过滤，免去后续正则扫描
+        if 'console.' not in content:
+            return 0
 
         original_content = content
-        replacement_count = 0
+
+        # 单遍替换全部 console 调用
+        content, replacement_count = _CONSOLE_RE.subn(_console_to_logger, content)
 
         # 检查是否已经导入了 logger
         has_logger_import = "import logger from" in content or "import { logger" in content
 
-        # 如果没有导入 logger，需要在导入部分添加
-        if not has_logger_import and ('console.' in content):
-            # 找到最后的 import 语句
-            import_matches = list(re.finditer(r"^import .+;$", content, re.MULTILINE))
-            if import_matches:
-                last_import = import_matches[-1]
+        # 如果没有导入 logger，在最后的 import 语句之后添加（一次拼接生成最终内容）
+        if not has_logger_import:
+            last_import = None
+            for last_import in _IMPORT_RE.finditer(content):
+                pass
+            if last_import:
                 insert_pos = last_import.end()
-                # 添加 logger 导入
-                content = content[:insert_pos] + f"\nimport logger from '@/utils/logger';" + content[insert_pos:]
+                content = ''.join([content[:insert_pos], _LOGGER_IMPORT, content[insert_pos:]])
                 replacement_count += 1
 
-        # 替换规则
-        replacements = [
-            # console.log -> logger.debug
-            (r'console\.log\(', 'logger.debug(', 'debug'),
-            # console.warn -> logger.warn
-            (r'console\.warn\(', 'logger.warn(', 'warn'),
-            # console.error -> logger.error
-            (r'console\.error\(', 'logger.error(', 'error'),
-            # console.info -> logger.info
-            (r'console\.info\(', 'logger.info(', 'info'),
-        ]
-
-        for pattern, replacement, level in replacements:
-            matches = re.findall(pattern, content)
-            if matches:
-                content = re.sub(pattern, replacement, content)
-                replacement_count += len(matches)
-
-        if replacement_count > 0:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            try:
-                rel_path = file_path.relative_to(base_path)
-            except ValueError:
-                rel_path = file_path
+        if replacement_count > 0 and content != original_content:
+            file_path.write_text(content, encoding='utf-8')
+            rel_path = file_path.relative_to(base_path) if base_path in file_path.parents else file_path
             print(f"[OK] {rel_path}: 替换了 {replacement_count} 处")
 
         return replacement_count
 
     except Exception as e:
-        try:
-            rel_path = file_path.relative_to(base_path)
-        except ValueError:
-            rel_path = file_path
+        rel_path = file_path.relative_to(base_path) if base_path in file_path.parents else file_path
         print(f"[ERROR] {rel_path}: {e}")
         return 0
 
@@ -89,21 +90,17 @@ def main():
         print(f"错误: 找不到 {frontend_src} 目录")
         return
 
-    total_replaced = 0
-    file_count = 0
-
-    # 只处理 .ts, .tsx 文件
-    for file_path in frontend_src.rglob("*.ts"):
-        replaced = replace_console_in_file(file_path, project_root)
-        total_replaced += replaced
-        if replaced > 0:
-            file_count += 1
-
-    for file_path in frontend_src.rglob("*.tsx"):
-        replaced = replace_console_in_file(file_path, project_root)
-        total_replaced += replaced
-        if replaced > 0:
-            file_count += 1
+    # 只处理 .ts, .tsx 文件；各文件互不依赖，用多进程并行处理
+    files = [*frontend_src.rglob("*.ts"), *frontend_src.rglob("*.tsx")]
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(
+            partial(replace_console_in_file, base_path=project_root),
+            files,
+            chunksize=32,
+        ))
+
+    total_replaced = sum(results)
+    file_count = sum(1 for replaced in results if replaced > 0)
 
     print(f"\n总计: 从 {file_count} 个文件中替换了约 {total_replaced} 处 console 调用")
 
@@ -2,18 +2,20 @@
 Server startup script
 """
 import sys
-import uvicorn
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from creative_autogpt.utils.config import get_settings
-from creative_autogpt.utils.logger import setup_logger
-
 
 def main():
     """Start the server"""
+    # Deferred so importing this module stays cheap
+    import uvicorn
+
+    from creative_autogpt.utils.config import get_settings
+    from creative_autogpt.utils.logger import setup_logger
+
     settings = get_settings()
     setup_logger()
 
@@ -32,6 +34,9 @@ def main():
         host=settings.app_host,
         port=settings.app_port,
         reload=settings.is_development,
+        # uvloop 事件循环 + httptools 解析器（uvloop 不支持 Windows）
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
         log_level=settings.log_level.lower(),
     )
 
@@ -8,13 +8,15 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from creative_autogpt.utils.llm_client import MultiLLMClient
-from creative_autogpt.utils.logger import setup_logger, logger
-from creative_autogpt.utils.config import get_settings
+DEFAULT_SEARCH_QUERIES = ("骑士和冒险",)
 
 
 async def test_llm():
     """Test LLM connectivity"""
+    from creative_autogpt.utils.llm_client import MultiLLMClient
+    from creative_autogpt.utils.logger import setup_logger, logger
+    from creative_autogpt.utils.config import get_settings
+
     setup_logger()
 
     settings = get_settings()
@@ -32,22 +34,28 @@ async def test_llm():
     # Test each provider
     providers = ["aliyun", "deepseek", "ark"]
 
-    for provider in providers:
-        try:
-            logger.info(f"Testing {provider}...")
-
-            response = await client.generate(
+    # Providers are independent, so test them concurrently
+    logger.info(f"Testing {', '.join(providers)}...")
+    responses = await asyncio.gather(
+        *(
+            client.generate(
                 prompt=test_prompt,
                 llm=provider,
                 temperature=0.7,
                 max_tokens=200,
             )
+            for provider in providers
+        ),
+        return_exceptions=True,
+    )
 
-            logger.info(f"{provider} response: {response.content[:100]}")
-            logger.info(f"Tokens: {response.usage.total_tokens}")
+    for provider, response in zip(providers, responses):
+        if isinstance(response, Exception):
+            logger.error(f"{provider} failed: {response}")
+            continue
 
-        except Exception as e:
-            logger.error(f"{provider} failed: {e}")
+        logger.info(f"{provider} response: {response.content[:100]}")
+        logger.info(f"Tokens: {response.usage.total_tokens}")
 
     # Test with routing
     logger.info("Testing intelligent routing...")
@@ -67,14 +75,15 @@ async def test_llm():
         logger.error(f"Routing test failed: {e}")
 
 
-async def test_embeddings():
+async def test_embeddings(queries=DEFAULT_SEARCH_QUERIES):
     """Test embedding functionality"""
+    from creative_autogpt.storage.vector_store import MemoryType, VectorStore
+    from creative_autogpt.utils.logger import setup_logger, logger
+
     setup_logger()
 
     logger.info("Testing embeddings...")
 
-    from creative_autogpt.storage.vector_store import VectorStore
-
     vector_store = VectorStore()
 
     # Test adding and searching
@@ -86,23 +95,23 @@ async def test_embeddings():
 
     logger.info("Adding test items...")
 
-    for i, text in enumerate(test_texts):
-        await vector_store.add(
-            content=text,
-            memory_type="general",
-            metadata={"test": True, "index": i},
-        )
+    # One collection.add call embeds all texts in a single batch
+    await vector_store.add_batch([
+        (text, MemoryType.GENERAL, {"test": True, "index": i})
+        for i, text in enumerate(test_texts)
+    ])
 
-    logger.info("Testing search...")
+    logger.info(f"Testing search ({len(queries)} queries)...")
 
-    results = await vector_store.search(
-        query="骑士和冒险",
-        top_k=2,
+    # Queries are independent, so issue them together
+    all_results = await asyncio.gather(
+        *(vector_store.search(query=query, top_k=2) for query in queries)
     )
 
-    logger.info(f"Found {len(results)} results")
-    for result in results:
-        logger.info(f"  Score: {result.score:.3f}, Content: {result.item.content[:50]}...")
+    for query, results in zip(queries, all_results):
+        logger.info(f"Query '{query}': found {len(results)} results")
+        for result in results:
+            logger.info(f"  Score: {result.score:.3f}, Content: {result.item.content[:50]}...")
 
 
 async def main():
@@ -111,13 +120,19 @@ async def main():
 
     parser = argparse.ArgumentParser(description="LLM testing")
     parser.add_argument("--test", choices=["llm", "embeddings", "all"], default="all")
+    parser.add_argument(
+        "--queries",
+        default=",".join(DEFAULT_SEARCH_QUERIES),
+        help="Comma-separated search queries for the embeddings test",
+    )
     args = parser.parse_args()
+    queries = [q.strip() for q in args.queries.split(",") if q.strip()]
 
     if args.test in ("llm", "all"):
         await test_llm()
 
     if args.test in ("embeddings", "all"):
-        await test_embeddings()
+        await test_embeddings(queries)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,9 @@
 """
 System integration test
+
+LLM 调用可录制/回放，避免每次运行都请求真实接口:
+    CREATIVE_AUTOGPT_TEST_MODE=record python scripts/test_system.py  # 调用接口并保存到 tests/cassettes/
+    CREATIVE_AUTOGPT_TEST_MODE=replay python scripts/test_system.py  # 仅从 tests/cassettes/ 回放
 """
 import asyncio
 import sys
@@ -8,6 +12,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from creative_autogpt.api.dependencies import create_llm_client, create_memory_manager
 from creative_autogpt.utils.llm_client import MultiLLMClient
 from creative_autogpt.core.vector_memory import VectorMemoryManager, MemoryType
 from creative_autogpt.core.task_planner import TaskPlanner, NovelTaskType
@@ -15,17 +20,14 @@ from creative_autogpt.core.evaluator import EvaluationEngine
 from creative_autogpt.core.loop_engine import LoopEngine
 from creative_autogpt.modes.novel import NovelMode
 from creative_autogpt.plugins.manager import PluginManager
-from creative_autogpt.storage.vector_store import VectorStore
 from creative_autogpt.utils.logger import setup_logger, logger
 from creative_autogpt.utils.config import get_settings
 
 
-async def test_basic_generation():
+async def test_basic_generation(client: MultiLLMClient):
     """Test basic LLM generation"""
     logger.info("=== Testing Basic Generation ===")
 
-    client = MultiLLMClient()
-
     response = await client.generate(
         prompt="请用100字左右介绍什么是玄幻小说。",
         task_type="大纲",  # Should route to Qwen
@@ -39,29 +41,27 @@ async def test_basic_generation():
     logger.info("✓ Basic generation test passed")
 
 
-async def test_vector_memory():
+async def test_vector_memory(memory: VectorMemoryManager):
     """Test vector memory"""
     logger.info("=== Testing Vector Memory ===")
 
-    vector_store = VectorStore()
-    memory = VectorMemoryManager(vector_store=vector_store)
-
-    # Add test data
-    await memory.store(
-        content="主角林动从小天赋异禀，却因家族变故而失去灵力",
-        task_id="test_1",
-        task_type="人物设计",
-        memory_type=MemoryType.CHARACTER,
-        metadata={"character": "林动", "role": "protagonist"},
-    )
-
-    await memory.store(
-        content="主角在深山中发现一枚神秘的石符，里面蕴含着强大的能量",
-        task_id="test_2",
-        task_type="事件",
-        memory_type=MemoryType.PLOT,
-        metadata={"importance": "high"},
-    )
+    # Add test data (one batched write, so both items are embedded together)
+    await memory.store_many([
+        {
+            "content": "主角林动从小天赋异禀，却因家族变故而失去灵力",
+            "task_id": "test_1",
+            "task_type": "人物设计",
+            "memory_type": MemoryType.CHARACTER,
+            "metadata": {"character": "林动", "role": "protagonist"},
+        },
+        {
+            "content": "主角在深山中发现一枚神秘的石符，里面蕴含着强大的能量",
+            "task_id": "test_2",
+            "task_type": "事件",
+            "memory_type": MemoryType.PLOT,
+            "metadata": {"importance": "high"},
+        },
+    ])
 
     # Test search
     context = await memory.get_context(
@@ -104,11 +104,10 @@ async def test_task_planner():
     logger.info("✓ Task planner test passed")
 
 
-async def test_evaluator():
+async def test_evaluator(llm_client: MultiLLMClient):
     """Test evaluator"""
     logger.info("=== Testing Evaluator ===")
 
-    llm_client = MultiLLMClient()
     evaluator = EvaluationEngine(llm_client=llm_client)
 
     test_content = """
@@ -161,14 +160,11 @@ async def test_mode():
     logger.info("✓ Novel mode test passed")
 
 
-async def test_full_pipeline():
+async def test_full_pipeline(llm_client: MultiLLMClient, memory: VectorMemoryManager):
     """Test the full pipeline (mini version)"""
     logger.info("=== Testing Full Pipeline ===")
 
     # Initialize components
-    llm_client = MultiLLMClient()
-    vector_store = VectorStore()
-    memory = VectorMemoryManager(vector_store=vector_store)
     evaluator = EvaluationEngine(llm_client=llm_client)
     mode = NovelMode(config={"genre": "玄幻"})
 
@@ -189,42 +185,47 @@ async def test_full_pipeline():
 
     logger.info(f"Generated {len(tasks)} tasks")
 
-    # Execute first task
-    task = tasks[0]
-    logger.info(f"Executing first task: {task.task_type.value}")
-
-    # Get context
-    context = await memory.get_context(
-        task_id=task.task_id,
-        task_type=task.task_type.value,
-    )
-
-    # Build prompt
-    prompt = await mode.build_prompt(
-        task_type=task.task_type.value,
-        context=context,
-        metadata=goal,
-    )
+    # Execute every task whose dependencies are already met. These are independent, so
+    # they run concurrently: each streams its response and stores it as soon as the
+    # stream ends, overlapping that task's embedding with the other tasks' generation
+    ready_tasks = planner.get_ready_tasks()
+    logger.info(f"Executing {len(ready_tasks)} ready tasks: {[t.task_type.value for t in ready_tasks]}")
+
+    async def execute_task(task):
+        context = await memory.get_context(
+            task_id=task.task_id,
+            task_type=task.task_type.value,
+        )
+        prompt = await mode.build_prompt(
+            task_type=task.task_type.value,
+            context=context,
+            metadata=goal,
+        )
+
+        # Generate
+        chunks = []
+        async for chunk in llm_client.generate_stream(
+            prompt=prompt,
+            task_type=task.task_type.value,
+            temperature=0.7,
+            max_tokens=500,
+        ):
+            chunks.append(chunk)
+        content = "".join(chunks)
+
+        logger.info(f"Generated content for {task.task_type.value}: {content[:200]}...")
+
+        # Store
+        await memory.store(
+            content=content,
+            task_id=task.task_id,
+            task_type=task.task_type.value,
+            memory_type=MemoryType.CHARACTER,
+            metadata={"chapter": 0},
+        )
 
-    # Generate
     logger.info("Generating with LLM...")
-    response = await llm_client.generate(
-        prompt=prompt,
-        task_type=task.task_type.value,
-        temperature=0.7,
-        max_tokens=500,
-    )
-
-    logger.info(f"Generated content: {response.content[:200]}...")
-
-    # Store
-    await memory.store(
-        content=response.content,
-        task_id=task.task_id,
-        task_type=task.task_type.value,
-        memory_type=MemoryType.CHARACTER,
-        metadata={"chapter": 0},
-    )
+    await asyncio.gather(*(execute_task(task) for task in ready_tasks))
 
     logger.info("✓ Full pipeline test passed")
 
@@ -243,24 +244,43 @@ async def main():
     ╚═══════════════════════════════════════════════════════╝
     """)
 
+    # Share one LLM client (and its connection pool) across all tests. The memory tests run
+    # concurrently, so each gets its own collection and only sees what it stored itself
+    llm_client = create_llm_client()
+
+    tests = [
+        test_basic_generation(llm_client),
+        test_vector_memory(create_memory_manager(session_id="sys_vmem")),
+        test_task_planner(),
+        test_evaluator(llm_client),
+        test_mode(),
+        test_full_pipeline(llm_client, create_memory_manager(session_id="sys_pipe")),
+    ]
+
+    # The tests are independent, so run them concurrently to overlap LLM latency
     try:
-        await test_basic_generation()
-        await test_vector_memory()
-        await test_task_planner()
-        await test_evaluator()
-        await test_mode()
-        await test_full_pipeline()
-
-        print("\n" + "="*50)
+        results = await asyncio.gather(*tests, return_exceptions=True)
+    finally:
+        await llm_client.close()
+
+    failures = [
+        (test.__name__, result)
+        for test, result in zip(tests, results)
+        if isinstance(result, BaseException)
+    ]
+
+    print("\n" + "="*50)
+    if not failures:
         print("✓ All tests passed successfully!")
         print("="*50)
-
-    except Exception as e:
-        logger.error(f"Test failed: {e}", exc_info=True)
-        print("\n" + "="*50)
-        print(f"✗ Test failed: {e}")
-        print("="*50)
-        sys.exit(1)
+        return
+
+    for name, error in failures:
+        logger.opt(exception=error).error(f"{name} failed: {error}")
+        print(f"✗ {name} failed: {error}")
+    print(f"{len(failures)}/{len(tests)} tests failed")
+    print("="*50)
+    sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -7,13 +7,44 @@ with multi-LLM collaboration and plugin-based element management.
 
 __version__ = "0.1.0"
 
-from creative_autogpt.core.loop_engine import LoopEngine
-from creative_autogpt.core.task_planner import TaskPlanner
-from creative_autogpt.core.evaluator import EvaluationEngine
-from creative_autogpt.core.vector_memory import VectorMemoryManager
-from creative_autogpt.utils.llm_client import MultiLLMClient
-from creative_autogpt.plugins.manager import PluginManager
-from creative_autogpt.modes.novel import NovelMode
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from creative_autogpt.core.loop_engine import LoopEngine
+    from creative_autogpt.core.task_planner import TaskPlanner
+    from creative_autogpt.core.evaluator import EvaluationEngine
+    from creative_autogpt.core.vector_memory import VectorMemoryManager
+    from creative_autogpt.utils.llm_client import MultiLLMClient
+    from creative_autogpt.plugins.manager import PluginManager
+    from creative_autogpt.modes.novel import NovelMode
+
+# Public names and the modules that define them. They are imported on first access
+# (PEP 562), so importing a single submodule does not load the whole engine stack.
+_LAZY_IMPORTS = {
+    "LoopEngine": "creative_autogpt.core.loop_engine",
+    "TaskPlanner": "creative_autogpt.core.task_planner",
+    "EvaluationEngine": "creative_autogpt.core.evaluator",
+    "VectorMemoryManager": "creative_autogpt.core.vector_memory",
+    "MultiLLMClient": "creative_autogpt.utils.llm_client",
+    "PluginManager": "creative_autogpt.plugins.manager",
+    "NovelMode": "creative_autogpt.modes.novel",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
 
 __all__ = [
     "LoopEngine",
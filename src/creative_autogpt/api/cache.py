@@ -0,0 +1,144 @@
+"""
+Per-process caches shared by API requests
+
+- SessionCache: short-lived cache of session records for read-heavy endpoints.
+  The character, foreshadow-context and derivative panels are polled by the
+  frontend and each poll re-reads and re-decodes the same session row. Caching
+  the row for a couple of seconds serves repeated polls from memory; handlers
+  that write a session call invalidate() so their own changes show up at once.
+- MemoryManagerPool: per-session VectorMemoryManager instances, so requests on
+  the same session reuse one Chroma client and collection handle.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from creative_autogpt.core.vector_memory import VectorMemoryManager
+from creative_autogpt.storage.session import SessionStorage
+
+
+class SessionCache:
+    """
+    TTL cache of SessionStorage.get_session results
+
+    Concurrent misses for the same session share a single storage read.
+    Missing sessions are not cached. Cached dicts are shared between callers
+    and must be treated as read-only.
+    """
+
+    def __init__(self, ttl: float = 2.0, max_entries: int = 256):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds a session record is served from the cache
+            max_entries: Maximum number of sessions kept
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._pending: Dict[str, "asyncio.Task[Optional[Dict[str, Any]]]"] = {}
+
+    async def get(self, storage: SessionStorage, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a session record, reading it from storage if not cached
+
+        Args:
+            storage: Storage to read from on a miss
+            session_id: The session ID
+
+        Returns:
+            Session data, or None if the session doesn't exist
+        """
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            expires_at, session = entry
+            if time.monotonic() < expires_at:
+                return session
+            del self._entries[session_id]
+
+        task = self._pending.get(session_id)
+        if task is None:
+            task = asyncio.create_task(self._load(storage, session_id))
+            self._pending[session_id] = task
+        # Shield so one cancelled request doesn't cancel the read others are waiting on
+        return await asyncio.shield(task)
+
+    def invalidate(self, session_id: str) -> None:
+        """Drop a session's cached record (call after writing the session)"""
+        self._entries.pop(session_id, None)
+        # A read already in flight may predate the write; later callers start a fresh one
+        self._pending.pop(session_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached records"""
+        self._entries.clear()
+        # As in invalidate(): reads in flight must not repopulate the cache
+        self._pending.clear()
+
+    async def _load(self, storage: SessionStorage, session_id: str) -> Optional[Dict[str, Any]]:
+        """Read a session from storage and cache it if it exists and wasn't invalidated meanwhile"""
+        current = asyncio.current_task()
+        try:
+            session = await storage.get_session(session_id)
+            if session is not None and self._pending.get(session_id) is current:
+                self._entries.pop(session_id, None)
+                while len(self._entries) >= self.max_entries:
+                    # Dicts keep insertion order, so the first key is the oldest entry
+                    del self._entries[next(iter(self._entries))]
+                self._entries[session_id] = (time.monotonic() + self.ttl, session)
+            return session
+        finally:
+            if self._pending.get(session_id) is current:
+                del self._pending[session_id]
+
+
+class MemoryManagerPool:
+    """
+    LRU pool of memory managers backed by session-specific vector store collections
+
+    Managers are created on first use; the least recently used one is dropped
+    once more than ``max_sessions`` sessions have been served.
+    """
+
+    def __init__(self, max_sessions: int = 32):
+        """
+        Initialize the pool
+
+        Args:
+            max_sessions: Maximum number of session memory managers kept
+        """
+        self.max_sessions = max_sessions
+
+        self._managers: "OrderedDict[str, VectorMemoryManager]" = OrderedDict()
+
+    def get(self, session_id: str) -> VectorMemoryManager:
+        """
+        Get the memory manager for a session, creating it if needed
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            VectorMemoryManager using the session's vector store collection
+        """
+        memory = self._managers.get(session_id)
+        if memory is not None:
+            self._managers.move_to_end(session_id)
+            return memory
+
+        # Imported here: api.dependencies imports this module
+        from creative_autogpt.api.dependencies import create_memory_manager
+
+        memory = create_memory_manager(session_id)
+        self._managers[session_id] = memory
+        while len(self._managers) > self.max_sessions:
+            self._managers.popitem(last=False)
+        return memory
+
+    def clear(self) -> None:
+        """Drop all pooled memory managers"""
+        self._managers.clear()
@@ -4,9 +4,11 @@ API dependencies for FastAPI
 
 from typing import Optional, Dict, Any
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.requests import HTTPConnection
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from creative_autogpt.api.cache import MemoryManagerPool, SessionCache
 from creative_autogpt.storage.session import SessionStorage
 from creative_autogpt.utils.llm_client import MultiLLMClient
 from creative_autogpt.core.vector_memory import VectorMemoryManager
@@ -18,66 +20,109 @@ from creative_autogpt.utils.config import get_settings
 security = HTTPBearer(auto_error=False)
 
 
-# Global dependencies
-_session_storage: Optional[SessionStorage] = None
-_llm_client: Optional[MultiLLMClient] = None
-_memory_manager: Optional[VectorMemoryManager] = None
-_evaluator: Optional[EvaluationEngine] = None
-_prompt_manager: Optional[PromptManager] = None
-_plugin_manager: Optional[PluginManager] = None
+def create_llm_client() -> MultiLLMClient:
+    """
+    Create an LLM client, with the response cache if enabled in settings
+
+    Outside "live" test mode the client records responses to, or replays them
+    from, the cassette directory (see creative_autogpt.utils.llm_recorder).
+    """
+    settings = get_settings()
+    cache = None
+    if settings.llm_cache_enabled:
+        from creative_autogpt.utils.llm_cache import LLMCache
+        cache = LLMCache.from_settings(settings)
+
+    if settings.llm_test_mode != "live":
+        from creative_autogpt.utils.llm_recorder import RecordReplayLLMClient
+        return RecordReplayLLMClient(
+            cassette_dir=settings.llm_cassette_dir,
+            mode=settings.llm_test_mode,
+            cache=cache,
+        )
+    return MultiLLMClient(cache=cache)
+
+
+def create_memory_manager(session_id: Optional[str] = None) -> VectorMemoryManager:
+    """Create a memory manager backed by the default (or a session-specific) vector store collection"""
+    from creative_autogpt.storage.vector_store import VectorStore
+    return VectorMemoryManager(vector_store=VectorStore(session_id=session_id))
+
+
+async def init_app_state(app: FastAPI) -> None:
+    """
+    Construct the shared service instances once and bind them to app.state
+
+    Called from the application lifespan before any request is served, so the
+    dependencies below are plain attribute reads with no lazy initialization.
+
+    Args:
+        app: The FastAPI application
+    """
+    session_storage = SessionStorage()
+    await session_storage.initialize()
+
+    llm_client = create_llm_client()
 
+    app.state.session_storage = session_storage
+    app.state.session_cache = SessionCache(ttl=get_settings().session_cache_ttl)
+    app.state.memory_pool = MemoryManagerPool(max_sessions=get_settings().session_memory_pool_size)
+    app.state.llm_client = llm_client
+    app.state.memory_manager = create_memory_manager()
+    app.state.evaluator = EvaluationEngine(llm_client=llm_client)
+    app.state.prompt_manager = PromptManager()
+    app.state.plugin_manager = PluginManager()
 
-async def get_session_storage() -> SessionStorage:
+
+async def close_app_state(app: FastAPI) -> None:
+    """
+    Release the resources held by the shared service instances
+
+    Args:
+        app: The FastAPI application
+    """
+    await app.state.llm_client.close()
+    await app.state.session_storage.close()
+
+
+async def get_session_storage(connection: HTTPConnection) -> SessionStorage:
     """Get session storage instance"""
-    global _session_storage
-    if _session_storage is None:
-        _session_storage = SessionStorage()
-        await _session_storage.initialize()
-    return _session_storage
+    return connection.app.state.session_storage
+
 
+async def get_session_cache(connection: HTTPConnection) -> SessionCache:
+    """Get the short-lived session record cache"""
+    return connection.app.state.session_cache
 
-async def get_llm_client() -> MultiLLMClient:
+
+async def get_llm_client(connection: HTTPConnection) -> MultiLLMClient:
     """Get LLM client instance"""
-    global _llm_client
-    if _llm_client is None:
-        _llm_client = MultiLLMClient()
-    return _llm_client
+    return connection.app.state.llm_client
 
 
-async def get_memory_manager() -> VectorMemoryManager:
+async def get_memory_manager(connection: HTTPConnection) -> VectorMemoryManager:
     """Get memory manager instance"""
-    global _memory_manager
-    if _memory_manager is None:
-        from creative_autogpt.storage.vector_store import VectorStore
-        vector_store = VectorStore()
-        _memory_manager = VectorMemoryManager(vector_store=vector_store)
-    return _memory_manager
+    return connection.app.state.memory_manager
+
+
+async def get_memory_pool(connection: HTTPConnection) -> MemoryManagerPool:
+    """Get the pool of per-session memory managers"""
+    return connection.app.state.memory_pool
 
 
-async def get_evaluator(
-    llm_client: MultiLLMClient = Depends(get_llm_client),
-) -> EvaluationEngine:
+async def get_evaluator(connection: HTTPConnection) -> EvaluationEngine:
     """Get evaluator instance"""
-    global _evaluator
-    if _evaluator is None:
-        _evaluator = EvaluationEngine(llm_client=llm_client)
-    return _evaluator
+    return connection.app.state.evaluator
 
 
-async def get_prompt_manager() -> PromptManager:
+async def get_prompt_manager(connection: HTTPConnection) -> PromptManager:
     """Get prompt manager instance"""
-    global _prompt_manager
-    if _prompt_manager is None:
-        _prompt_manager = PromptManager()
-    return _prompt_manager
+    return connection.app.state.prompt_manager
 
 
-async def get_plugin_manager() -> PluginManager:
+async def get_plugin_manager(connection: HTTPConnection) -> PluginManager:
     """Get plugin manager instance"""
-    global _plugin_manager
-    if _plugin_manager is None:
-        _plugin_manager = PluginManager()
-    return _plugin_manager
+    return connection.app.state.plugin_manager
 
 
 async def verify_session(
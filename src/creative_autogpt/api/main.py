@@ -2,35 +2,130 @@
 FastAPI application factory
 """
 
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
+from creative_autogpt.api.dependencies import close_app_state, get_llm_client, init_app_state
 from creative_autogpt.api.schemas.response import HealthResponse
-from creative_autogpt.utils.config import get_settings
+from creative_autogpt.utils.config import Settings, get_settings
+from creative_autogpt.utils.llm_client import MultiLLMClient, ProviderTier, track_provider_tiers
 from creative_autogpt.api.routes import sessions, websocket, prompts, chapters, characters, foreshadows, derivative
 from creative_autogpt.utils.logger import setup_logger
 
+# Seconds a serialized /health response is reused while the provider list is unchanged
+HEALTH_CACHE_TTL = 5.0
+
+# Upper bound on prompts generated by the startup cache warm-up
+PREFETCH_MAX_ENTRIES = 20
+
+# Response header reporting which provider tiers served a request's LLM calls
+CACHE_STATUS_HEADER = "X-AI-Cache-Status"
+
+CACHE_TIERS = {ProviderTier.CACHE_L1, ProviderTier.CACHE_L2}
+
+
+def cache_status(tiers: List[ProviderTier]) -> str:
+    """
+    Format the X-AI-Cache-Status value for the tiers that served a request
+
+    HIT if every LLM call was answered from the cache, MISS if none was, PARTIAL
+    otherwise, followed by the tier of each call in order, e.g. ``PARTIAL; tiers=cache_l1,remote_strong``.
+    """
+    hits = sum(1 for tier in tiers if tier in CACHE_TIERS)
+    status = "HIT" if hits == len(tiers) else "MISS" if hits == 0 else "PARTIAL"
+    return f"{status}; tiers={','.join(tier.value for tier in tiers)}"
+
+
+async def warm_llm_cache(llm_client: MultiLLMClient, settings: Settings) -> None:
+    """
+    Populate an LLM client's semantic cache with common setting prompts
+
+    Builds the prompts NovelMode produces for the configured (task type, genre)
+    pairs with an empty memory context and stores one response for each in the
+    semantic (L2) layer, scoped by the max_tokens LoopEngine uses for the task.
+    Engine requests are sampled, so they can only hit these entries when
+    ``llm_cache_sampled_semantic_threshold`` is set; the warm-up is skipped
+    otherwise. A session's first planning tasks, whose memory context is still
+    nearly empty, are the ones close enough to hit. Prompts already in the
+    (persistent) semantic layer are not generated again, so restarts don't
+    repeat the calls.
+    """
+    from creative_autogpt.core.loop_engine import LoopEngine
+    from creative_autogpt.core.task_planner import NovelTaskType
+    from creative_autogpt.core.vector_memory import MemoryContext
+    from creative_autogpt.modes.novel import NovelMode
+
+    cache = llm_client.cache
+    if cache is None or cache.vector_store is None or cache.sampled_semantic_threshold is None:
+        logger.info(
+            "LLM cache warm-up skipped: engine requests are sampled and only hit the semantic "
+            "cache when llm_cache_semantic_enabled and llm_cache_sampled_semantic_threshold are set"
+        )
+        return
+
+    pairs = [
+        (task_type, genre)
+        for genre in settings.prefetch_genres
+        for task_type in settings.prefetch_task_types
+    ][:PREFETCH_MAX_ENTRIES]
+
+    warmed = 0
+    for task_type, genre in pairs:
+        try:
+            engine_task_type = NovelTaskType(task_type)
+            max_tokens = LoopEngine._get_max_tokens_for_task(engine_task_type)
+
+            mode = NovelMode(config={"genre": genre})
+            context = MemoryContext(task_id=f"prefetch_{task_type}_{genre}", task_type=task_type)
+            prompt = await mode.build_prompt(task_type=task_type, context=context, metadata={"genre": genre})
+            if await cache.has_similar(prompt, task_type, max_tokens):
+                warmed += 1
+                continue
+
+            response = await llm_client.generate(
+                prompt=prompt,
+                task_type=task_type,
+                temperature=LoopEngine._get_temperature_for_task(engine_task_type),
+                max_tokens=max_tokens,
+                use_cache=False,
+            )
+            await cache.prime(prompt, task_type, max_tokens, response)
+            warmed += 1
+        except Exception as e:
+            logger.warning(f"LLM cache warm-up failed for {task_type}/{genre}: {e}")
+
+    logger.info(f"LLM cache warm-up finished: {warmed}/{len(pairs)} prompts cached")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager"""
     # Startup
     logger.info("Starting Creative AutoGPT API")
-    setup_logger()
+    # Hand log writes to a background thread so request handlers never block on sink I/O
+    setup_logger(enqueue=True)
 
     settings = get_settings()
 
-    # Initialize database storage
-    from creative_autogpt.storage.session import SessionStorage
+    # Construct the shared storage, LLM client, etc. once and bind them to app.state
     from creative_autogpt.core.engine_registry import get_registry
 
-    storage = SessionStorage()
-    await storage.initialize()
+    await init_app_state(app)
+    storage = app.state.session_storage
+
+    # Warm the LLM cache in the background so startup isn't delayed
+    prefetch_task: Optional[asyncio.Task] = None
+    if settings.prefetch_enabled and settings.llm_cache_enabled:
+        prefetch_task = asyncio.create_task(warm_llm_cache(app.state.llm_client, settings))
 
     # Configure EngineRegistry with storage
     registry = await get_registry()
@@ -49,17 +144,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down Creative AutoGPT API")
 
+    if prefetch_task is not None and not prefetch_task.done():
+        prefetch_task.cancel()
+        # Wait for the warm-up to unwind before the client and vector store it uses are closed
+        with suppress(asyncio.CancelledError):
+            await prefetch_task
+
     # Shutdown registry to clean up any running engines
     try:
         await registry.shutdown()
     except Exception as e:
         logger.error(f"Error shutting down registry: {e}")
 
-    # Close storage
+    # Close storage and the shared LLM client's connection pools
     try:
-        await storage.close()
+        await close_app_state(app)
     except Exception as e:
-        logger.error(f"Error closing storage: {e}")
+        logger.error(f"Error closing shared services: {e}")
+
+    # Flush log records still queued for the background writer
+    await logger.complete()
 
 
 def create_app() -> FastAPI:
@@ -71,13 +175,18 @@ def create_app() -> FastAPI:
     """
     settings = get_settings()
 
+    # Resolve environment-dependent values once; the handlers below close over these constants
+    is_development = settings.is_development
+    docs_url = "/docs" if is_development else None
+
     app = FastAPI(
         title="Creative AutoGPT API",
         description="AI-powered creative writing system for long-form novels",
         version="0.1.0",
-        docs_url="/docs" if settings.is_development else None,
-        redoc_url="/redoc" if settings.is_development else None,
+        docs_url=docs_url,
+        redoc_url="/redoc" if is_development else None,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # CORS middleware
@@ -98,54 +207,83 @@ def create_app() -> FastAPI:
     app.include_router(foreshadows.router)  # 🔥 伏笔追踪 API
     app.include_router(derivative.router)  # 🔥 二创配置 API
 
-    # Root endpoint
+    # Root endpoint (the payload never changes, so it is serialized once)
+    root_body = orjson.dumps({
+        "name": "Creative AutoGPT API",
+        "version": "0.1.0",
+        "status": "running",
+        "docs": docs_url,
+    })
+
     @app.get("/")
     async def root():
-        return {
-            "name": "Creative AutoGPT API",
-            "version": "0.1.0",
-            "status": "running",
-            "docs": "/docs" if settings.is_development else None,
-        }
-
-    # Health check
+        return Response(content=root_body, media_type="application/json")
+
+    # Health check (serialized body cached for HEALTH_CACHE_TTL seconds per provider list)
+    health_cache: Dict[str, Any] = {"providers": None, "expires_at": 0.0, "body": b""}
+
     @app.get("/health", response_model=HealthResponse)
-    async def health():
+    async def health(llm_client: MultiLLMClient = Depends(get_llm_client)):
         """Health check endpoint"""
-        from creative_autogpt.utils.llm_client import MultiLLMClient
-
-        llm_client = MultiLLMClient()
         providers = llm_client.get_available_providers()
 
-        return HealthResponse(
-            status="healthy",
-            version="0.1.0",
-            llm_providers=providers,
-            storage_status="ok",
-            memory_status="ok",
-        )
+        now = time.monotonic()
+        if now >= health_cache["expires_at"] or providers != health_cache["providers"]:
+            health_cache["body"] = orjson.dumps(HealthResponse(
+                status="healthy",
+                version="0.1.0",
+                llm_providers=providers,
+                storage_status="ok",
+                memory_status="ok",
+            ).model_dump())
+            health_cache["providers"] = providers
+            health_cache["expires_at"] = now + HEALTH_CACHE_TTL
+
+        return Response(content=health_cache["body"], media_type="application/json")
+
+    # Global exception handler (error details are only exposed in development)
+    if is_development:
+        error_detail = str
+    else:
+        def error_detail(exc: Exception) -> str:
+            return "An error occurred"
 
-    # Global exception handler
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
         logger.error(f"Unhandled exception: {exc}", exc_info=True)
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": "Internal server error",
-                "detail": str(exc) if settings.is_development else "An error occurred",
+                "detail": error_detail(exc),
             },
         )
 
-    # Request logging middleware
+    # Request logging middleware (sampled; health probes are never logged)
+    access_log_sample_rate = settings.access_log_sample_rate
+    if access_log_sample_rate is None:
+        access_log_sample_rate = 1.0 if is_development else 0.01
+
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
+        if request.url.path == "/health" or random.random() >= access_log_sample_rate:
+            return await call_next(request)
+
         logger.info(f"{request.method} {request.url.path}")
         response = await call_next(request)
         logger.info(f"{request.method} {request.url.path} - {response.status_code}")
         return response
 
+    # Report cache hits to clients (only on requests that called the LLM)
+    @app.middleware("http")
+    async def report_cache_status(request: Request, call_next):
+        tiers = track_provider_tiers()
+        response = await call_next(request)
+        if tiers:
+            response.headers[CACHE_STATUS_HEADER] = cache_status(tiers)
+        return response
+
     return app
 
 
@@ -2,18 +2,62 @@
 Chapter API routes - Chapter rewrite and version management
 """
 
+import asyncio
+from collections import defaultdict
+from itertools import islice
 from typing import List, Optional, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from loguru import logger
 
 from creative_autogpt.api.schemas.response import SuccessResponse
-from creative_autogpt.storage.session import SessionStorage
-from creative_autogpt.api.dependencies import get_session_storage
+from creative_autogpt.storage.session import CHAPTER_VERSION_SUMMARY_FIELDS, SessionStorage
+from creative_autogpt.api.cache import MemoryManagerPool, SessionCache
+from creative_autogpt.api.dependencies import (
+    get_evaluator,
+    get_llm_client,
+    get_memory_pool,
+    get_session_cache,
+    get_session_storage,
+)
+from creative_autogpt.core.chapter_rewriter import ChapterRewriter
+from creative_autogpt.core.evaluator import EvaluationEngine
+from creative_autogpt.utils.llm_client import MultiLLMClient
 
 router = APIRouter(prefix="/chapters", tags=["chapters"])
 
 
+async def _no_tasks() -> List[Dict[str, Any]]:
+    """Placeholder for a task query that doesn't need to run (e.g. the chapter before chapter 0)"""
+    return []
+
+
+def _foreshadow_context(
+    element: Dict[str, Any],
+    plants: Dict[str, List],
+    payoffs: Dict[str, List],
+    chapter_index: int,
+) -> Dict[str, Any]:
+    """章节上下文中一条伏笔的摘要（状态及与本章的关系）"""
+    element_id = element.get("element_id", "")
+    plant_chapter = element.get("plant_chapter")
+    payoff_chapter = element.get("payoff_chapter")
+
+    has_plant = len(plants.get(element_id, ())) > 0
+    has_payoff = len(payoffs.get(element_id, ())) > 0
+    return {
+        "id": element_id,
+        "name": element.get("name"),
+        "importance": element.get("importance"),
+        "status": "paid_off" if has_payoff else "planted" if has_plant else "pending",
+        "plant_chapter": plant_chapter,
+        "payoff_chapter": payoff_chapter,
+        "relation": "埋设" if plant_chapter == chapter_index else
+                    "回收" if payoff_chapter == chapter_index else
+                    "附近",
+    }
+
+
 @router.post("/{session_id}/rewrite")
 async def rewrite_chapter(
     session_id: str,
@@ -22,6 +66,9 @@ async def rewrite_chapter(
     feedback: Optional[str] = None,
     max_retries: int = 3,
     storage: SessionStorage = Depends(get_session_storage),
+    llm_client: MultiLLMClient = Depends(get_llm_client),
+    evaluator: EvaluationEngine = Depends(get_evaluator),
+    memory_pool: MemoryManagerPool = Depends(get_memory_pool),
 ):
     """
     重写指定章节
@@ -32,20 +79,17 @@ async def rewrite_chapter(
     - **feedback**: 用户反馈（可选）
     - **max_retries**: 最大重试次数（默认3次）
     """
-    # 验证会话存在
-    session = await storage.get_session(session_id)
+    # 验证会话和章节存在（两次查询互不依赖，并发执行）
+    session, tasks = await asyncio.gather(
+        storage.get_session(session_id),
+        storage.get_task_results(session_id, chapter_index=chapter_index),
+    )
     if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Session {session_id} not found"
         )
 
-    # 验证章节存在
-    tasks = await storage.get_task_results(
-        session_id,
-        chapter_index=chapter_index,
-    )
-
     if not tasks:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,24 +97,12 @@ async def rewrite_chapter(
         )
 
     try:
-        # 导入重写器（避免循环导入）
-        from creative_autogpt.core.chapter_rewriter import ChapterRewriter
-        from creative_autogpt.utils.llm_client import MultiLLMClient
-        from creative_autogpt.storage.vector_store import VectorStore
-        from creative_autogpt.core.vector_memory import VectorMemoryManager
-        from creative_autogpt.core.evaluator import EvaluationEngine
-
-        # 创建重写器
-        llm_client = MultiLLMClient()
-        vector_store = VectorStore(session_id=session_id)
-        memory = VectorMemoryManager(vector_store=vector_store)
-        evaluator = EvaluationEngine(llm_client=llm_client)
-
+        # 复用应用级的 LLM 客户端、评估器和会话记忆，每次请求只创建轻量的重写器
         rewriter = ChapterRewriter(
             session_id=session_id,
             storage=storage,
             llm_client=llm_client,
-            memory=memory,
+            memory=memory_pool.get(session_id),
             evaluator=evaluator,
         )
 
@@ -129,25 +161,25 @@ async def list_chapters(
         tasks = await storage.get_task_results(session_id)
 
         # 按章节索引分组
-        chapters: Dict[int, List[Dict]] = {}
+        chapters: Dict[int, List[Dict]] = defaultdict(list)
         for task in tasks:
             chapter_index = task.get("chapter_index")
             if chapter_index is not None:
-                if chapter_index not in chapters:
-                    chapters[chapter_index] = []
                 chapters[chapter_index].append(task)
 
-        # 获取每个章节的版本信息
+        # 批量获取各章节最近3个版本的摘要、版本总数和当前版本
+        all_versions = await storage.get_all_chapter_versions(
+            session_id, limit=3, fields=CHAPTER_VERSION_SUMMARY_FIELDS
+        )
+
         result = []
         for chapter_index in sorted(chapters.keys()):
-            versions = await storage.get_chapter_versions(session_id, chapter_index)
-            current_version = await storage.get_current_chapter_version(session_id, chapter_index)
-
+            chapter_versions = all_versions.get(chapter_index, {})
             result.append({
                 "chapter_index": chapter_index,
-                "total_versions": len(versions),
-                "current_version": current_version,
-                "versions": versions[:3],  # 只返回最近3个版本
+                "total_versions": chapter_versions.get("total", 0),
+                "current_version": chapter_versions.get("current"),
+                "versions": chapter_versions.get("versions", []),  # 最近3个版本的摘要
             })
 
         return {
@@ -175,16 +207,17 @@ async def get_chapter_versions(
     - **session_id**: 会话ID
     - **chapter_index**: 章节索引
     """
-    # 验证会话存在
-    session = await storage.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found"
-        )
-
     try:
-        versions = await storage.get_chapter_versions(session_id, chapter_index)
+        # 会话校验与版本查询并发执行
+        session, versions = await asyncio.gather(
+            storage.get_session(session_id),
+            storage.get_chapter_versions(session_id, chapter_index),
+        )
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Session {session_id} not found"
+            )
 
         return {
             "success": True,
@@ -193,6 +226,8 @@ async def get_chapter_versions(
             "versions": versions,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get chapter versions: {e}", exc_info=True)
         raise HTTPException(
@@ -215,20 +250,17 @@ async def restore_chapter_version(
     - **chapter_index**: 章节索引
     - **version_id**: 版本ID
     """
-    # 验证会话存在
-    session = await storage.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found"
-        )
-
     try:
-        # 获取任务ID
-        tasks = await storage.get_task_results(
-            session_id,
-            chapter_index=chapter_index,
+        # 会话校验与章节任务查询并发执行
+        session, tasks = await asyncio.gather(
+            storage.get_session(session_id),
+            storage.get_task_results(session_id, chapter_index=chapter_index),
         )
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Session {session_id} not found"
+            )
 
         if not tasks:
             raise HTTPException(
@@ -282,24 +314,17 @@ async def get_chapter_version_detail(
     - **chapter_index**: 章节索引
     - **version_id**: 版本ID
     """
-    # 验证会话存在
-    session = await storage.get_session(session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {session_id} not found"
-        )
-
     try:
-        # 获取所有版本
-        versions = await storage.get_chapter_versions(session_id, chapter_index)
-
-        # 查找指定版本
-        version = None
-        for v in versions:
-            if v["id"] == version_id:
-                version = v
-                break
+        # 会话校验与版本查询并发执行
+        session, version = await asyncio.gather(
+            storage.get_session(session_id),
+            storage.get_chapter_version_by_id(session_id, chapter_index, version_id),
+        )
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Session {session_id} not found"
+            )
 
         if not version:
             raise HTTPException(
@@ -327,6 +352,7 @@ async def get_chapter_context(
     session_id: str,
     chapter_index: int,
     storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
 ):
     """
     获取章节的上下文信息（相关人物、门派、伏笔等）
@@ -334,8 +360,12 @@ async def get_chapter_context(
     - **session_id**: 会话ID
     - **chapter_index**: 章节索引
     """
-    # 验证会话存在
-    session = await storage.get_session(session_id)
+    # 会话校验与前后章节的任务查询并发执行（只取相邻两章，不拉取全部任务）
+    session, prev_tasks, next_tasks = await asyncio.gather(
+        session_cache.get(storage, session_id),
+        storage.get_task_results(session_id, chapter_index=chapter_index - 1) if chapter_index > 0 else _no_tasks(),
+        storage.get_task_results(session_id, chapter_index=chapter_index + 1),
+    )
     if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -353,7 +383,6 @@ async def get_chapter_context(
         # 提取人物信息
         character_data = plugin_states.get("character", {})
         characters = character_data.get("characters", {})
-        relationships = character_data.get("relationships", {})
 
         # 提取伏笔信息
         foreshadow_data = plugin_states.get("foreshadow", {})
@@ -363,8 +392,7 @@ async def get_chapter_context(
 
         # 找出本章相关的人物（简化逻辑：返回主要人物）
         relevant_characters = []
-        for char_id, char_data in list(characters.items())[:10]:  # 限制数量
-            char_relationships = relationships.get(char_id, [])
+        for char_id, char_data in islice(characters.items(), 10):  # 限制数量
             relevant_characters.append({
                 "id": char_id,
                 "name": char_data.get("name", "Unknown"),
@@ -372,46 +400,26 @@ async def get_chapter_context(
                 "personality_traits": char_data.get("personality", {}).get("traits", [])[:5],
             })
 
-        # 找出本章相关的伏笔（需要在本章回收或附近埋设的）
-        relevant_foreshadows = []
-        for element in elements:
-            element_id = element.get("element_id", "")
-            plant_chapter = element.get("plant_chapter")
-            payoff_chapter = element.get("payoff_chapter")
-
-            # 如果伏笔在当前章节附近（前后5章）
-            if plant_chapter and abs(plant_chapter - chapter_index) <= 5:
-                has_plant = element_id in plants and len(plants[element_id]) > 0
-                has_payoff = element_id in payoffs and len(payoffs[element_id]) > 0
-                status = "paid_off" if has_payoff else "planted" if has_plant else "pending"
-                relevant_foreshadows.append({
-                    "id": element_id,
-                    "name": element.get("name"),
-                    "importance": element.get("importance"),
-                    "status": status,
-                    "plant_chapter": plant_chapter,
-                    "payoff_chapter": payoff_chapter,
-                    "relation": "埋设" if plant_chapter == chapter_index else
-                                 "回收" if payoff_chapter == chapter_index else
-                                 "附近",
-                })
+        # 找出本章相关的伏笔（在当前章节前后5章埋设的），取够5个即停止
+        relevant_foreshadows = list(islice(
+            (
+                _foreshadow_context(element, plants, payoffs, chapter_index)
+                for element in elements
+                if element.get("plant_chapter") and abs(element["plant_chapter"] - chapter_index) <= 5
+            ),
+            5,
+        ))
 
         # 获取前一章和后一章的信息
         previous_chapter = None
         next_chapter = None
 
-        all_tasks = await storage.get_task_results(session_id)
-        chapter_tasks = [t for t in all_tasks if t.get("chapter_index") is not None]
-
-        if chapter_index > 0:
-            prev_tasks = [t for t in chapter_tasks if t.get("chapter_index") == chapter_index - 1]
-            if prev_tasks:
-                previous_chapter = {
-                    "chapter_index": chapter_index - 1,
-                    "has_content": any(t.get("result") for t in prev_tasks),
-                }
+        if prev_tasks:
+            previous_chapter = {
+                "chapter_index": chapter_index - 1,
+                "has_content": any(t.get("result") for t in prev_tasks),
+            }
 
-        next_tasks = [t for t in chapter_tasks if t.get("chapter_index") == chapter_index + 1]
         if next_tasks:
             next_chapter = {
                 "chapter_index": chapter_index + 1,
@@ -423,7 +431,7 @@ async def get_chapter_context(
             "context": {
                 "chapter_index": chapter_index,
                 "characters": relevant_characters,
-                "foreshadows": relevant_foreshadows[:5],  # 限制数量
+                "foreshadows": relevant_foreshadows,
                 "previous_chapter": previous_chapter,
                 "next_chapter": next_chapter,
             }
@@ -8,11 +8,14 @@ Provides endpoints for managing character data, including:
 - Character relationships
 """
 
+from collections import Counter
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from loguru import logger
 
+from creative_autogpt.api.cache import SessionCache
+from creative_autogpt.api.dependencies import get_session_cache, get_session_storage
 from creative_autogpt.storage.session import SessionStorage
 from creative_autogpt.plugins.character import CharacterPlugin
 
@@ -23,7 +26,9 @@ router = APIRouter(prefix="/characters", tags=["characters"])
 @router.get("/{session_id}")
 async def list_characters(
     session_id: str,
-    role: Optional[str] = Query(None, description="Filter by role (protagonist, antagonist, supporting, etc.)")
+    role: Optional[str] = Query(None, description="Filter by role (protagonist, antagonist, supporting, etc.)"),
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
 ) -> Dict[str, Any]:
     """
     Get all characters for a session
@@ -31,10 +36,8 @@ async def list_characters(
     Returns character list with basic info and metadata
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data to extract plugin states
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -64,9 +67,7 @@ async def list_characters(
             char_arcs = arcs.get(char_id, [])
 
             # Count appearances (from arc data)
-            appearances = 0
-            for arc in char_arcs:
-                appearances += arc.get("chapters", [])
+            appearances = sum(len(arc.get("chapters", ())) for arc in char_arcs)
 
             character_list.append({
                 "id": char_id,
@@ -96,17 +97,20 @@ async def list_characters(
 
 
 @router.get("/{session_id}/{character_id}")
-async def get_character_detail(session_id: str, character_id: str) -> Dict[str, Any]:
+async def get_character_detail(
+    session_id: str,
+    character_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Get detailed information about a specific character
 
     Includes full profile, relationships, and development arcs
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -155,17 +159,19 @@ async def get_character_detail(session_id: str, character_id: str) -> Dict[str,
 
 
 @router.get("/{session_id}/stats")
-async def get_character_stats(session_id: str) -> Dict[str, Any]:
+async def get_character_stats(
+    session_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Get character statistics for the session
 
     Returns counts by role, total appearances, etc.
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -183,14 +189,11 @@ async def get_character_stats(session_id: str) -> Dict[str, Any]:
         arcs = characters_data.get("arcs", {})
 
         # Calculate stats
-        role_counts = {}
+        role_counts = Counter(c.get("role", "unspecified") for c in characters.values())
         total_relationships = 0
         total_appearances = 0
 
-        for char_id, char_data in characters.items():
-            role = char_data.get("role", "unspecified")
-            role_counts[role] = role_counts.get(role, 0) + 1
-
+        for char_id in characters:
             total_relationships += len(relationships.get(char_id, []))
 
             for arc in arcs.get(char_id, []):
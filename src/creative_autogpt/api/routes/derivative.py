@@ -5,11 +5,13 @@ Provides endpoints for managing derivative creation configuration (sequels, preq
 """
 
 from typing import Any, Dict, Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from loguru import logger
 
+from creative_autogpt.api.cache import SessionCache
+from creative_autogpt.api.dependencies import get_session_cache, get_session_storage
 from creative_autogpt.storage.session import SessionStorage
 
 
@@ -56,15 +58,17 @@ class DerivativeConfigUpdate(BaseModel):
 
 
 @router.get("/{session_id}")
-async def get_derivative_config(session_id: str) -> Dict[str, Any]:
+async def get_derivative_config(
+    session_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Get derivative configuration for a session
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -94,16 +98,16 @@ async def get_derivative_config(session_id: str) -> Dict[str, Any]:
 @router.post("/{session_id}")
 async def create_derivative_config(
     session_id: str,
-    data: DerivativeConfigCreate
+    data: DerivativeConfigCreate,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
 ) -> Dict[str, Any]:
     """
     Create derivative configuration for a session
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await storage.get_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -118,11 +122,9 @@ async def create_derivative_config(
         # Create derivative config
         derivative_config = data.model_dump()
 
-        # Update session config
-        config["derivative"] = derivative_config
-        session_data["config"] = config
-
-        await session_storage.update_session(session_id, session_data)
+        # Write only the derivative key of the session config
+        await storage.patch_session_config(session_id, updates={"derivative": derivative_config})
+        session_cache.invalidate(session_id)
 
         return {
             "success": True,
@@ -139,16 +141,16 @@ async def create_derivative_config(
 @router.put("/{session_id}")
 async def update_derivative_config(
     session_id: str,
-    data: DerivativeConfigUpdate
+    data: DerivativeConfigUpdate,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
 ) -> Dict[str, Any]:
     """
     Update derivative configuration for a session
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await storage.get_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -164,11 +166,9 @@ async def update_derivative_config(
         update_data = data.model_dump(exclude_unset=True)
         derivative_config.update(update_data)
 
-        # Update session config
-        config["derivative"] = derivative_config
-        session_data["config"] = config
-
-        await session_storage.update_session(session_id, session_data)
+        # Write only the derivative key of the session config
+        await storage.patch_session_config(session_id, updates={"derivative": derivative_config})
+        session_cache.invalidate(session_id)
 
         return {
             "success": True,
@@ -183,15 +183,17 @@ async def update_derivative_config(
 
 
 @router.delete("/{session_id}")
-async def delete_derivative_config(session_id: str) -> Dict[str, Any]:
+async def delete_derivative_config(
+    session_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Delete derivative configuration for a session
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await storage.get_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -204,10 +206,8 @@ async def delete_derivative_config(session_id: str) -> Dict[str, Any]:
             )
 
         # Remove derivative config
-        del config["derivative"]
-        session_data["config"] = config
-
-        await session_storage.update_session(session_id, session_data)
+        await storage.patch_session_config(session_id, remove=["derivative"])
+        session_cache.invalidate(session_id)
 
         return {
             "success": True,
@@ -222,15 +222,17 @@ async def delete_derivative_config(session_id: str) -> Dict[str, Any]:
 
 
 @router.post("/{session_id}/generate")
-async def generate_derivative(session_id: str) -> Dict[str, Any]:
+async def generate_derivative(
+    session_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Start derivative creation process based on configuration
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
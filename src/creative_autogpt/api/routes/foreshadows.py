@@ -10,11 +10,13 @@ Provides endpoints for managing foreshadowing elements, including:
 """
 
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 
 from loguru import logger
 
+from creative_autogpt.api.cache import SessionCache
+from creative_autogpt.api.dependencies import get_session_cache, get_session_storage
 from creative_autogpt.storage.session import SessionStorage
 
 
@@ -46,7 +48,9 @@ class ForeshadowUpdate(BaseModel):
 async def list_foreshadows(
     session_id: str,
     status: Optional[str] = Query(None, description="Filter by status: planted, paid_off, pending"),
-    importance: Optional[str] = Query(None, description="Filter by importance: critical, major, minor")
+    importance: Optional[str] = Query(None, description="Filter by importance: critical, major, minor"),
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
 ) -> Dict[str, Any]:
     """
     Get all foreshadow elements for a session
@@ -54,10 +58,8 @@ async def list_foreshadows(
     Supports filtering by status and importance
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -159,17 +161,19 @@ async def list_foreshadows(
 
 
 @router.get("/{session_id}/stats")
-async def get_foreshadow_stats(session_id: str) -> Dict[str, Any]:
+async def get_foreshadow_stats(
+    session_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Get foreshadow statistics for the session
 
     Returns counts by status, importance, and warnings
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -234,17 +238,19 @@ async def get_foreshadow_stats(session_id: str) -> Dict[str, Any]:
 
 
 @router.get("/{session_id}/warnings")
-async def get_foreshadow_warnings(session_id: str) -> Dict[str, Any]:
+async def get_foreshadow_warnings(
+    session_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Get foreshadow warnings for the session
 
     Returns alerts for overdue or approaching payoffs
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -319,17 +325,20 @@ async def get_foreshadow_warnings(session_id: str) -> Dict[str, Any]:
 
 
 @router.get("/{session_id}/{element_id}")
-async def get_foreshadow_detail(session_id: str, element_id: str) -> Dict[str, Any]:
+async def get_foreshadow_detail(
+    session_id: str,
+    element_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Get detailed information about a specific foreshadow element
 
     Includes plant locations, payoff locations, and related context
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await session_cache.get(storage, session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -382,15 +391,18 @@ async def get_foreshadow_detail(session_id: str, element_id: str) -> Dict[str, A
 
 
 @router.post("/{session_id}")
-async def create_foreshadow(session_id: str, data: ForeshadowCreate) -> Dict[str, Any]:
+async def create_foreshadow(
+    session_id: str,
+    data: ForeshadowCreate,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Create a new foreshadow element
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await storage.get_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -433,7 +445,8 @@ async def create_foreshadow(session_id: str, data: ForeshadowCreate) -> Dict[str
         else:
             session_data["goal"]["metadata"] = plugin_states
 
-        await session_storage.update_session(session_id, session_data)
+        await storage.update_session(session_id, session_data)
+        session_cache.invalidate(session_id)
 
         return {
             "success": True,
@@ -452,16 +465,16 @@ async def create_foreshadow(session_id: str, data: ForeshadowCreate) -> Dict[str
 async def update_foreshadow(
     session_id: str,
     element_id: str,
-    data: ForeshadowUpdate
+    data: ForeshadowUpdate,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
 ) -> Dict[str, Any]:
     """
     Update an existing foreshadow element
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await storage.get_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -509,7 +522,8 @@ async def update_foreshadow(
         else:
             session_data["goal"]["metadata"] = plugin_states
 
-        await session_storage.update_session(session_id, session_data)
+        await storage.update_session(session_id, session_data)
+        session_cache.invalidate(session_id)
 
         return {
             "success": True,
@@ -524,15 +538,18 @@ async def update_foreshadow(
 
 
 @router.delete("/{session_id}/{element_id}")
-async def delete_foreshadow(session_id: str, element_id: str) -> Dict[str, Any]:
+async def delete_foreshadow(
+    session_id: str,
+    element_id: str,
+    storage: SessionStorage = Depends(get_session_storage),
+    session_cache: SessionCache = Depends(get_session_cache),
+) -> Dict[str, Any]:
     """
     Delete a foreshadow element
     """
     try:
-        session_storage = SessionStorage()
-
         # Get session data
-        session_data = await session_storage.get_session(session_id)
+        session_data = await storage.get_session(session_id)
         if not session_data:
             raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
 
@@ -575,7 +592,8 @@ async def delete_foreshadow(session_id: str, element_id: str) -> Dict[str, Any]:
         else:
             session_data["goal"]["metadata"] = plugin_states
 
-        await session_storage.update_session(session_id, session_data)
+        await storage.update_session(session_id, session_data)
+        session_cache.invalidate(session_id)
 
         return {
             "success": True,
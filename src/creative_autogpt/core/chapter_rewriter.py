@@ -131,10 +131,11 @@ class ChapterRewriter:
                 previous_evaluation=best_evaluation,
             )
 
-            # 调用 LLM 生成新内容
+            # 调用 LLM 生成新内容（不走响应缓存：同样的重写请求也应得到新的采样结果）
             response = await self.llm_client.generate(
                 task_type="章节内容",
                 prompt=prompt,
+                use_cache=False,
             )
 
             # 评估新内容
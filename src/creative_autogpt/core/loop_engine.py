@@ -5865,7 +5865,8 @@ class LoopEngine:
         
         return input_cost + output_cost
 
-    def _get_temperature_for_task(self, task_type: NovelTaskType) -> float:
+    @staticmethod
+    def _get_temperature_for_task(task_type: NovelTaskType) -> float:
         """Get appropriate temperature for a task type"""
         # Creative tasks need higher temperature
         high_temp_tasks = {
@@ -5888,7 +5889,8 @@ class LoopEngine:
         else:
             return 0.7
 
-    def _get_max_tokens_for_task(self, task_type: NovelTaskType) -> int:
+    @staticmethod
+    def _get_max_tokens_for_task(task_type: NovelTaskType) -> int:
         """Get appropriate max tokens for a task type"""
         # 逐章生成需要较多 tokens
         if task_type == NovelTaskType.CHAPTER_CONTENT:
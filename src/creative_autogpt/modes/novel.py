@@ -11,9 +11,9 @@ Implements the standard novel creation pipeline with:
 - Quality evaluation
 """
 
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
-
 from creative_autogpt.modes.base import Mode, WritingMode, register_mode
 from creative_autogpt.core.task_planner import NovelTaskType
 from creative_autogpt.core.vector_memory import MemoryContext
@@ -180,41 +180,53 @@ class NovelMode(Mode):
         """Get genre-specific writing guidance for prompts"""
         # 优先从元数据获取类型，更可靠
         genre = (metadata.get("goal_style") if metadata else None) or self.genre
-        genre_config = self.GENRE_CONFIGS.get(genre, {})
-        guidance = genre_config.get("writing_guidance", {})
+        return self._genre_guidance_text(genre)
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _genre_guidance_text(cls, genre: str) -> str:
+        """Guidance section for a genre (static per genre, so built once and cached)"""
+        guidance = cls.GENRE_CONFIGS.get(genre, {}).get("writing_guidance", {})
 
         if not guidance:
             return ""
 
-        guidance_text = "\n### 风格特定写作指导\n"
+        parts = ["\n### 风格特定写作指导\n"]
         if guidance.get("tone"):
-            guidance_text += f"**基调**: {guidance['tone']}\n"
+            parts.append(f"**基调**: {guidance['tone']}\n")
         if guidance.get("psychology"):
-            guidance_text += f"**心理描写**: {guidance['psychology']}\n"
+            parts.append(f"**心理描写**: {guidance['psychology']}\n")
         if guidance.get("narrative"):
-            guidance_text += f"**叙事技巧**: {guidance['narrative']}\n"
+            parts.append(f"**叙事技巧**: {guidance['narrative']}\n")
         if guidance.get("dialogue"):
-            guidance_text += f"**对话风格**: {guidance['dialogue']}\n"
+            parts.append(f"**对话风格**: {guidance['dialogue']}\n")
 
-        return guidance_text
+        return "".join(parts)
 
     def _get_author_style_guidance(self, metadata: Optional[Dict[str, Any]] = None) -> str:
         """Get author style guidance for prompts"""
         author_style = (metadata.get("goal_author_style") if metadata else None) or ""
-        if not author_style or author_style not in self.AUTHOR_STYLES:
+        return self._author_style_guidance_text(author_style)
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _author_style_guidance_text(cls, author_style: str) -> str:
+        """Guidance section for an author style (static per style, so built once and cached)"""
+        if not author_style or author_style not in cls.AUTHOR_STYLES:
             return ""
 
-        style_config = self.AUTHOR_STYLES[author_style]
+        style_config = cls.AUTHOR_STYLES[author_style]
 
-        guidance_text = f"\n### 📝 参考作者风格：{style_config['name']}\n"
-        guidance_text += f"**风格特点**: {style_config['style_desc']}\n\n"
-        guidance_text += "**写作特征**:\n"
-        for feature in style_config['writing_features']:
-            guidance_text += f"- {feature}\n"
-        guidance_text += f"\n**参考**: {style_config['example']}\n"
-        guidance_text += "\n请模仿这位作者的写作风格，但不要照搬具体情节和人物。\n"
+        parts = [
+            f"\n### 📝 参考作者风格：{style_config['name']}\n",
+            f"**风格特点**: {style_config['style_desc']}\n\n",
+            "**写作特征**:\n",
+        ]
+        parts.extend(f"- {feature}\n" for feature in style_config['writing_features'])
+        parts.append(f"\n**参考**: {style_config['example']}\n")
+        parts.append("\n请模仿这位作者的写作风格，但不要照搬具体情节和人物。\n")
 
-        return guidance_text
+        return "".join(parts)
 
     async def _get_examples_text(self, context: MemoryContext, metadata: Optional[Dict[str, Any]] = None) -> str:
         """Get examples text for prompt"""
@@ -9,8 +9,9 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+import orjson
 from loguru import logger
-from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, Boolean, Float, Index, select, delete, update
+from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, Boolean, Float, Index, select, delete, update, text, func
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
@@ -20,6 +21,22 @@ from creative_autogpt.utils.config import get_settings
 Base_Model = declarative_base()
 
 
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON column values with orjson (non-string keys are stringified like the stdlib does)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _json_path(key: str) -> str:
+    """SQLite JSON path of a top-level object key (quoted, so "." in keys is literal)"""
+    if '"' in key:
+        raise ValueError(f"Config key cannot contain a double quote: {key!r}")
+    return f'$."{key}"'
+
+
+# 章节版本列表的摘要字段（不含正文等大字段）
+CHAPTER_VERSION_SUMMARY_FIELDS = ["id", "version_number", "is_current", "score", "created_at"]
+
+
 class SessionStatus(str, Enum):
     """Status of a writing session"""
 
@@ -106,7 +123,7 @@ class ChapterVersionModel(Base_Model):
     __tablename__ = "chapter_versions"
 
     id = Column(String, primary_key=True)
-    session_id = Column(String, nullable=False, index=True)
+    session_id = Column(String, nullable=False)  # 由复合索引前缀覆盖
     task_id = Column(String, nullable=False, index=True)
     chapter_index = Column(Integer, nullable=False, index=True)
 
@@ -135,9 +152,13 @@ class ChapterVersionModel(Base_Model):
     cost_usd = Column(Float, default=0.0)
 
     # 复合索引：session_id + chapter_index + version_number
+    # 部分索引：仅当前版本（session_id + chapter_index）
     __table_args__ = (
         Index('ix_chapter_versions_session_chapter_version',
               'session_id', 'chapter_index', 'version_number'),
+        Index('ix_chapter_versions_current',
+              'session_id', 'chapter_index',
+              sqlite_where=text('is_current = 1')),
         {'sqlite_autoincrement': True}
     )
 
@@ -167,6 +188,8 @@ class SessionStorage:
         self.engine = create_async_engine(
             self.db_url,
             echo=settings.is_development,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
 
         # Create session factory
@@ -415,6 +438,43 @@ class SessionStorage:
 
         return False
 
+    async def patch_session_config(
+        self,
+        session_id: str,
+        updates: Optional[Dict[str, Any]] = None,
+        remove: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Set or remove top-level keys of a session's config in place
+
+        Issues a single UPDATE with json_set/json_remove, so only the changed
+        keys are sent and other config keys written concurrently are kept.
+
+        Args:
+            session_id: The session ID
+            updates: Config keys to set, mapped to their new values
+            remove: Config keys to remove
+
+        Returns:
+            True if the session exists
+        """
+        config = func.coalesce(SessionModel.config, "{}")
+        if updates:
+            args = []
+            for key, value in updates.items():
+                args += [_json_path(key), func.json(_json_serializer(value))]
+            config = func.json_set(config, *args)
+        if remove:
+            config = func.json_remove(config, *[_json_path(key) for key in remove])
+
+        async with self.session_factory() as session:
+            stmt = update(SessionModel).where(
+                SessionModel.id == session_id
+            ).values(config=config, updated_at=datetime.utcnow())
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.rowcount > 0
+
     async def save_engine_state(
         self,
         session_id: str,
@@ -957,48 +1017,175 @@ class SessionStorage:
         self,
         session_id: str,
         chapter_index: int,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
-        获取章节的所有版本
+        获取章节的版本
 
         Args:
             session_id: 会话ID
             chapter_index: 章节索引
+            limit: 最多返回的版本数（None 表示全部）
+            fields: 只查询这些列（如 CHAPTER_VERSION_SUMMARY_FIELDS），None 表示完整信息
 
         Returns:
             版本列表，按版本号降序排列
         """
         async with self.session_factory() as session:
-            stmt = select(ChapterVersionModel).where(
+            entities = self._chapter_version_columns(fields) if fields else [ChapterVersionModel]
+            stmt = select(*entities).where(
                 ChapterVersionModel.session_id == session_id,
                 ChapterVersionModel.chapter_index == chapter_index,
             ).order_by(ChapterVersionModel.version_number.desc())
+            if limit is not None:
+                stmt = stmt.limit(limit)
 
             result = await session.execute(stmt)
-            versions = result.scalars().all()
 
-            return [
-                {
-                    "id": v.id,
-                    "version_number": v.version_number,
-                    "is_current": v.is_current,
-                    "content": v.content,
-                    "score": v.score,
-                    "quality_score": v.quality_score,
-                    "consistency_score": v.consistency_score,
-                    "evaluation": v.evaluation,
-                    "created_at": v.created_at.isoformat(),
-                    "created_by": v.created_by,
-                    "rewrite_reason": v.rewrite_reason,
-                    "token_stats": {
-                        "total_tokens": v.total_tokens,
-                        "prompt_tokens": v.prompt_tokens,
-                        "completion_tokens": v.completion_tokens,
-                        "cost_usd": v.cost_usd,
-                    }
-                }
-                for v in versions
-            ]
+            if fields:
+                return [self._chapter_version_fields_to_dict(row, fields) for row in result]
+            return [self._chapter_version_to_dict(v) for v in result.scalars()]
+
+    async def get_chapter_version_by_id(
+        self,
+        session_id: str,
+        chapter_index: int,
+        version_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        按ID获取章节的单个版本
+
+        Args:
+            session_id: 会话ID
+            chapter_index: 章节索引
+            version_id: 版本ID
+
+        Returns:
+            版本的完整信息，如果不存在（或不属于该章节）则返回 None
+        """
+        async with self.session_factory() as session:
+            stmt = select(ChapterVersionModel).where(
+                ChapterVersionModel.id == version_id,
+                ChapterVersionModel.session_id == session_id,
+                ChapterVersionModel.chapter_index == chapter_index,
+            )
+            result = await session.execute(stmt)
+            version = result.scalar_one_or_none()
+
+            if version:
+                return self._chapter_version_to_dict(version)
+            return None
+
+    async def get_all_chapter_versions(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        获取会话中所有章节的版本（版本列表和当前版本各一次查询）
+
+        Args:
+            session_id: 会话ID
+            limit: 每章最多返回的版本数（None 表示全部）
+            fields: 版本列表只查询这些列，None 表示完整信息
+
+        Returns:
+            {章节索引: {"versions": 版本列表（按版本号降序）, "total": 版本总数, "current": 当前版本或 None}}
+        """
+        columns = self._chapter_version_columns(fields or [c.key for c in ChapterVersionModel.__table__.columns])
+
+        async with self.session_factory() as session:
+            # 窗口函数在数据库内完成每章截取和计数，超出 limit 的版本不会被读出
+            ranked = select(
+                *columns,
+                ChapterVersionModel.chapter_index.label("_chapter_index"),
+                func.row_number().over(
+                    partition_by=ChapterVersionModel.chapter_index,
+                    order_by=ChapterVersionModel.version_number.desc(),
+                ).label("_rank"),
+                func.count().over(partition_by=ChapterVersionModel.chapter_index).label("_total"),
+            ).where(
+                ChapterVersionModel.session_id == session_id,
+            ).subquery()
+
+            stmt = select(ranked).order_by(ranked.c._chapter_index, ranked.c._rank)
+            if limit is not None:
+                stmt = stmt.where(ranked.c._rank <= limit)
+
+            chapters: Dict[int, Dict[str, Any]] = {}
+            for row in await session.execute(stmt):
+                chapter = chapters.setdefault(
+                    row._chapter_index, {"versions": [], "total": row._total, "current": None}
+                )
+                chapter["versions"].append(
+                    self._chapter_version_fields_to_dict(row, fields) if fields
+                    else self._chapter_version_to_dict(row)
+                )
+
+            # 当前版本可能不在截取范围内，走部分索引单独查询
+            current_stmt = select(ChapterVersionModel).where(
+                ChapterVersionModel.session_id == session_id,
+                ChapterVersionModel.is_current == True,
+            )
+            for v in (await session.execute(current_stmt)).scalars():
+                if v.chapter_index in chapters:
+                    chapters[v.chapter_index]["current"] = self._current_chapter_version_to_dict(v)
+
+            return chapters
+
+    @staticmethod
+    def _chapter_version_columns(fields: List[str]) -> List[Column]:
+        """按字段名取章节版本的列"""
+        table_columns = ChapterVersionModel.__table__.columns
+        unknown = [f for f in fields if f not in table_columns]
+        if unknown:
+            raise ValueError(f"Unknown chapter version fields: {unknown}")
+        return [table_columns[f] for f in fields]
+
+    @staticmethod
+    def _chapter_version_fields_to_dict(row: Any, fields: List[str]) -> Dict[str, Any]:
+        """章节版本的部分字段"""
+        data = {f: getattr(row, f) for f in fields}
+        if data.get("created_at") is not None:
+            data["created_at"] = data["created_at"].isoformat()
+        return data
+
+    @staticmethod
+    def _chapter_version_to_dict(v: ChapterVersionModel) -> Dict[str, Any]:
+        """章节版本的完整信息"""
+        return {
+            "id": v.id,
+            "version_number": v.version_number,
+            "is_current": v.is_current,
+            "content": v.content,
+            "score": v.score,
+            "quality_score": v.quality_score,
+            "consistency_score": v.consistency_score,
+            "evaluation": v.evaluation,
+            "created_at": v.created_at.isoformat(),
+            "created_by": v.created_by,
+            "rewrite_reason": v.rewrite_reason,
+            "token_stats": {
+                "total_tokens": v.total_tokens,
+                "prompt_tokens": v.prompt_tokens,
+                "completion_tokens": v.completion_tokens,
+                "cost_usd": v.cost_usd,
+            }
+        }
+
+    @staticmethod
+    def _current_chapter_version_to_dict(version: ChapterVersionModel) -> Dict[str, Any]:
+        """当前版本的摘要信息（get_current_chapter_version 的返回格式）"""
+        return {
+            "id": version.id,
+            "version_number": version.version_number,
+            "content": version.content,
+            "score": version.score,
+            "evaluation": version.evaluation,
+            "created_at": version.created_at.isoformat(),
+        }
 
     async def restore_chapter_version(
         self,
@@ -1096,14 +1283,7 @@ class SessionStorage:
             version = result.scalar_one_or_none()
 
             if version:
-                return {
-                    "id": version.id,
-                    "version_number": version.version_number,
-                    "content": version.content,
-                    "score": version.score,
-                    "evaluation": version.evaluation,
-                    "created_at": version.created_at.isoformat(),
-                }
+                return self._current_chapter_version_to_dict(version)
             return None
 
     async def close(self) -> None:
@@ -5,6 +5,7 @@ Uses ChromaDB for vector storage and retrieval with configurable embeddings.
 Supports Aliyun embeddings as the primary provider.
 """
 
+import threading
 import time
 import uuid
 from dataclasses import dataclass, field
@@ -20,6 +21,11 @@ from loguru import logger
 
 from creative_autogpt.utils.config import get_settings
 
+# Embedding functions shared by every VectorStore in the process, keyed by configuration, so
+# per-session stores reuse one set of sentence-transformers weights / API client
+_embedding_functions: Dict[Tuple[str, ...], Any] = {}
+_embedding_functions_lock = threading.Lock()
+
 
 class MemoryType(str, Enum):
     """Types of memory entries"""
@@ -124,13 +130,24 @@ class VectorStore:
         )
 
         # Initialize embedding function
-        self.embedding_function = self._create_embedding_function()
-
-        # Get or create collection
+        self.embedding_function = self._get_embedding_function()
+
+        # Get or create collection. Chroma indexes every collection with HNSW (hnswlib), so searches
+        # are approximate graph traversals rather than linear scans; the space stays squared L2
+        # because scores and the cosine conversions in callers assume it. There is deliberately no separate
+        # brute-force path for small collections: at chapter scale (a few thousand items) the HNSW query is
+        # already sub-millisecond next to the remote embedding call every search makes, and Chroma searches
+        # its not-yet-indexed write buffer exhaustively on its own.
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
             embedding_function=self.embedding_function,
-            metadata={"description": f"Creative AutoGPT memory collection{f' for session {session_id[:8]}' if session_id else ''}"},
+            metadata={
+                "description": f"Creative AutoGPT memory collection{f' for session {session_id[:8]}' if session_id else ''}",
+                "hnsw:space": "l2",
+                "hnsw:M": settings.chroma_hnsw_m,
+                "hnsw:construction_ef": settings.chroma_hnsw_construction_ef,
+                "hnsw:search_ef": settings.chroma_hnsw_search_ef,
+            },
         )
 
         logger.info(
@@ -138,6 +155,24 @@ class VectorStore:
             f"containing {self.collection.count()} existing items"
         )
 
+    def _get_embedding_function(self):
+        """Return the process-wide embedding function for this configuration, creating it on first use"""
+        settings = get_settings()
+        if settings.aliyun_api_key and settings.aliyun_embedding_base_url:
+            key = (
+                "aliyun",
+                settings.aliyun_api_key,
+                settings.aliyun_embedding_model,
+                str(settings.aliyun_embedding_dimension),
+            )
+        else:
+            key = ("sentence-transformers", self.embedding_model)
+
+        with _embedding_functions_lock:
+            if key not in _embedding_functions:
+                _embedding_functions[key] = self._create_embedding_function()
+            return _embedding_functions[key]
+
     def _create_embedding_function(self):
         """Create embedding function based on configuration"""
         settings = get_settings()
@@ -149,9 +184,10 @@ class VectorStore:
                 import dashscope
 
                 class AliyunEmbeddingFunction(embedding_functions.EmbeddingFunction):
-                    def __init__(self, api_key: str, model: str = "text-embedding-v3"):
+                    def __init__(self, api_key: str, model: str = "text-embedding-v3", dimension: int = 1024):
                         self.api_key = api_key
                         self.model = model
+                        self.dimension = dimension
                         dashscope.api_key = api_key
 
                     def __call__(self, texts: List[str]) -> List[List[float]]:
@@ -164,6 +200,7 @@ class VectorStore:
                                     model=self.model,
                                     input=text,
                                     text_type="document",
+                                    dimension=self.dimension,
                                 )
                                 if response.status_code == 200:
                                     emb = response.output["embeddings"][0]["embedding"]
@@ -173,16 +210,17 @@ class VectorStore:
                                         f"Aliyun embedding failed: {response.message}"
                                     )
                                     # Fallback to zeros
-                                    embeddings.append([0.0] * 1024)
+                                    embeddings.append([0.0] * self.dimension)
                             except Exception as e:
                                 logger.error(f"Aliyun embedding error: {e}")
-                                embeddings.append([0.0] * 1024)
+                                embeddings.append([0.0] * self.dimension)
 
                         return embeddings
 
                 return AliyunEmbeddingFunction(
                     api_key=settings.aliyun_api_key,
                     model=settings.aliyun_embedding_model,
+                    dimension=settings.aliyun_embedding_dimension,
                 )
 
             except ImportError:
@@ -230,40 +268,7 @@ class VectorStore:
             The ID of the added item
         """
         item_id = item_id or str(uuid.uuid4())
-
-        # Prepare metadata
-        item_metadata = {
-            "memory_type": memory_type.value,
-            "created_at": datetime.utcnow().isoformat(),
-        }
-
-        if metadata:
-            # Filter out None values and complex types (dict, list) as Chroma only accepts str, int, float, bool
-            for k, v in metadata.items():
-                if v is None:
-                    continue
-                # Chroma 只支持 str, int, float, bool 类型
-                if isinstance(v, (str, int, float, bool)):
-                    item_metadata[k] = v
-                elif isinstance(v, (dict, list)):
-                    # 复杂类型转为 JSON 字符串存储
-                    import json
-                    try:
-                        item_metadata[k] = json.dumps(v, ensure_ascii=False)
-                    except:
-                        logger.warning(f"Could not serialize metadata key '{k}', skipping")
-                else:
-                    # 其他类型尝试转为字符串
-                    try:
-                        item_metadata[k] = str(v)
-                    except:
-                        logger.warning(f"Could not convert metadata key '{k}' to string, skipping")
-
-        if task_id:
-            item_metadata["task_id"] = task_id
-
-        if chapter_index is not None:
-            item_metadata["chapter_index"] = chapter_index
+        item_metadata = self._build_metadata(memory_type, metadata, task_id, chapter_index)
 
         # Add to collection
         try:
@@ -300,17 +305,9 @@ class VectorStore:
         metadatas = []
 
         for content, memory_type, metadata in items:
-            item_id = str(uuid.uuid4())
-            ids.append(item_id)
+            ids.append(str(uuid.uuid4()))
             documents.append(content)
-
-            item_metadata = {
-                "memory_type": memory_type.value,
-                "created_at": datetime.utcnow().isoformat(),
-            }
-            # Filter out None values as Chroma doesn't accept them
-            item_metadata.update({k: v for k, v in metadata.items() if v is not None})
-            metadatas.append(item_metadata)
+            metadatas.append(self._build_metadata(memory_type, metadata))
 
         try:
             self.collection.add(
@@ -351,49 +348,17 @@ class VectorStore:
         """
         start_time = time.time()
 
-        # Build where clause
-        where_clause = {}
-        if memory_type:
-            where_clause["memory_type"] = memory_type.value
-        if chapter_index is not None:
-            where_clause["chapter_index"] = chapter_index
-        if where:
-            where_clause.update(where)
+        where_clause = self._build_where(memory_type, chapter_index, where)
 
         # Query collection
         try:
             results = self.collection.query(
                 query_texts=[query],
                 n_results=top_k,
-                where=where_clause if where_clause else None,
+                where=where_clause,
             )
 
-            # Convert to SearchResult objects
-            search_results = []
-            if results["ids"] and results["ids"][0]:
-                for i, item_id in enumerate(results["ids"][0]):
-                    # Convert distance to similarity score (ChromaDB uses L2 distance)
-                    distance = results["distances"][0][i] if results["distances"] else None
-                    score = 1.0 / (1.0 + distance) if distance is not None else 0.0
-
-                    # Filter by minimum score
-                    if score < min_score:
-                        continue
-
-                    item = VectorMemoryItem(
-                        id=item_id,
-                        content=results["documents"][0][i],
-                        memory_type=MemoryType(
-                            results["metadatas"][0][i].get("memory_type", "general")
-                        ),
-                        metadata=results["metadatas"][0][i],
-                        task_id=results["metadatas"][0][i].get("task_id"),
-                        chapter_index=results["metadatas"][0][i].get("chapter_index"),
-                    )
-
-                    search_results.append(
-                        SearchResult(item=item, score=score, distance=distance)
-                    )
+            search_results = self._to_search_results(results, min_score)
 
             elapsed = time.time() - start_time
             logger.debug(
@@ -406,6 +371,96 @@ class VectorStore:
             logger.error(f"Vector search failed: {e}")
             return []
 
+    @staticmethod
+    def _build_metadata(
+        memory_type: MemoryType,
+        metadata: Optional[Dict[str, Any]] = None,
+        task_id: Optional[str] = None,
+        chapter_index: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Build Chroma-compatible item metadata (str, int, float and bool values only)"""
+        item_metadata = {
+            "memory_type": memory_type.value,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+
+        if metadata:
+            # Filter out None values and complex types (dict, list) as Chroma only accepts str, int, float, bool
+            for k, v in metadata.items():
+                if v is None:
+                    continue
+                # Chroma 只支持 str, int, float, bool 类型
+                if isinstance(v, (str, int, float, bool)):
+                    item_metadata[k] = v
+                elif isinstance(v, (dict, list)):
+                    # 复杂类型转为 JSON 字符串存储
+                    import json
+                    try:
+                        item_metadata[k] = json.dumps(v, ensure_ascii=False)
+                    except:
+                        logger.warning(f"Could not serialize metadata key '{k}', skipping")
+                else:
+                    # 其他类型尝试转为字符串
+                    try:
+                        item_metadata[k] = str(v)
+                    except:
+                        logger.warning(f"Could not convert metadata key '{k}' to string, skipping")
+
+        if task_id:
+            item_metadata["task_id"] = task_id
+
+        if chapter_index is not None:
+            item_metadata["chapter_index"] = chapter_index
+
+        return item_metadata
+
+    @staticmethod
+    def _build_where(
+        memory_type: Optional[MemoryType] = None,
+        chapter_index: Optional[int] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Build a Chroma where clause from the common search filters"""
+        where_clause = {}
+        if memory_type:
+            where_clause["memory_type"] = memory_type.value
+        if chapter_index is not None:
+            where_clause["chapter_index"] = chapter_index
+        if where:
+            where_clause.update(where)
+        return where_clause if where_clause else None
+
+    @staticmethod
+    def _to_search_results(results: Dict[str, Any], min_score: float) -> List[SearchResult]:
+        """Convert a single-query Chroma result into SearchResult objects"""
+        search_results = []
+        if results["ids"] and results["ids"][0]:
+            for i, item_id in enumerate(results["ids"][0]):
+                # Convert distance to similarity score (ChromaDB uses L2 distance)
+                distance = results["distances"][0][i] if results["distances"] else None
+                score = 1.0 / (1.0 + distance) if distance is not None else 0.0
+
+                # Filter by minimum score
+                if score < min_score:
+                    continue
+
+                item = VectorMemoryItem(
+                    id=item_id,
+                    content=results["documents"][0][i],
+                    memory_type=MemoryType(
+                        results["metadatas"][0][i].get("memory_type", "general")
+                    ),
+                    metadata=results["metadatas"][0][i],
+                    task_id=results["metadatas"][0][i].get("task_id"),
+                    chapter_index=results["metadatas"][0][i].get("chapter_index"),
+                )
+
+                search_results.append(
+                    SearchResult(item=item, score=score, distance=distance)
+                )
+
+        return search_results
+
     async def get_by_id(self, item_id: str) -> Optional[VectorMemoryItem]:
         """
         Get an item by its ID
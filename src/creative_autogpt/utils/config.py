@@ -2,6 +2,7 @@
 
 from typing import Optional, List
 from pathlib import Path
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -28,6 +29,10 @@ class Settings(BaseSettings):
     # Vector Database
     chroma_persist_directory: str = "./data/chroma"
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # HNSW index parameters for new Chroma collections (M, build-time ef, query-time ef)
+    chroma_hnsw_m: int = 16
+    chroma_hnsw_construction_ef: int = 64
+    chroma_hnsw_search_ef: int = 40
 
     # LLM Configuration
     default_provider: str = "multi"  # multi, aliyun, deepseek, ark
@@ -41,12 +46,37 @@ class Settings(BaseSettings):
     llm_request_timeout: int = 3600  # 60 minutes for batch chapter generation (128K tokens)
     max_retries: int = 3
 
+    # LLM response cache (exact match in memory, semantic match in the vector store)
+    llm_cache_enabled: bool = False
+    llm_cache_ttl: int = 3600
+    llm_cache_max_entries: int = 1024
+    llm_cache_semantic_enabled: bool = True
+    llm_cache_semantic_threshold: float = 0.95
+    llm_cache_sampled_semantic_threshold: Optional[float] = None  # None: no semantic hits when temperature > 0
+
+    # Test harness: "live" calls providers, "record" also saves each response as a cassette,
+    # "replay" serves responses from cassettes only (set via CREATIVE_AUTOGPT_TEST_MODE)
+    llm_test_mode: str = Field(
+        default="live",
+        validation_alias=AliasChoices("creative_autogpt_test_mode", "llm_test_mode"),
+    )
+    llm_cassette_dir: str = "./tests/cassettes"
+
+    # Warm the semantic LLM cache at startup with setting prompts for common genres
+    # (requires llm_cache_enabled and llm_cache_sampled_semantic_threshold; see api.main.warm_llm_cache)
+    prefetch_enabled: bool = False
+    prefetch_genres: List[str] = ["玄幻", "科幻", "都市", "仙侠"]
+    prefetch_task_types: List[str] = ["创意脑暴", "大纲", "人物设计", "世界观规则"]
+
     # Aliyun (Qwen)
     aliyun_api_key: Optional[str] = None
     aliyun_base_url: str = "https://dashscope.aliyuncs.com/compatible-mode/v1"
     aliyun_model: str = "qwen-long"
     aliyun_enabled: bool = True
     aliyun_embedding_model: str = "text-embedding-v3"
+    # text-embedding-v3 also supports 768/512/256/128/64. Chroma stores vectors as float32 (no half-precision
+    # option), so this is the knob for index memory: 512 halves it. Existing collections keep their dimension.
+    aliyun_embedding_dimension: int = 1024
     aliyun_embedding_base_url: str = "https://dashscope.aliyuncs.com/api/v1/services/embeddings/text-embedding/text-embedding-v3"
 
     # DeepSeek
@@ -67,6 +97,13 @@ class Settings(BaseSettings):
     nvidia_model: str = "deepseek-ai/DeepSeek-V3"
     nvidia_enabled: bool = False
 
+    # Local model (OpenAI-compatible server such as Ollama or llama.cpp), tried before remote providers
+    local_llm_base_url: str = "http://localhost:11434/v1"
+    local_llm_model: str = "qwen2.5:7b"
+    local_llm_enabled: bool = False
+    local_llm_task_types: List[str] = []  # task types routed to the local model first
+    local_llm_few_shot_examples: int = 3  # similar cached responses prepended as examples
+
     # Storage
     storage_type: str = "local"  # local, s3
     local_storage_path: str = "./data/novels"
@@ -76,9 +113,12 @@ class Settings(BaseSettings):
     log_file: str = "./logs/app.log"
     log_rotation: str = "1 day"
     log_retention: str = "30 days"
+    access_log_sample_rate: Optional[float] = None  # fraction of requests logged; None: 1.0 in development, 0.01 otherwise
 
     # Performance
     max_concurrent_tasks: int = 5
+    session_cache_ttl: float = 2.0  # seconds polled panel endpoints reuse a session record
+    session_memory_pool_size: int = 32  # per-session vector memory managers kept by the API
     worker_pool_size: int = 10
 
     # CORS
@@ -0,0 +1,319 @@
+"""
+Two-layer response cache for MultiLLMClient
+
+- L1: exact match on a SHA-256 of the request parameters, kept in memory with a TTL
+- L2: semantic match on the prompt embedding, kept in a dedicated VectorStore collection
+
+Repeated or near-identical prompts are answered from the cache instead of a provider round-trip.
+The semantic layer also supplies few-shot examples for MultiLLMClient's local tier.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import orjson
+from loguru import logger
+
+from creative_autogpt.utils.llm_client import LLMResponse, ProviderTier
+
+if TYPE_CHECKING:
+    from creative_autogpt.storage.vector_store import VectorStore
+    from creative_autogpt.utils.config import Settings
+
+LLM_CACHE_COLLECTION = "creative_autogpt_llm_cache"
+
+
+class LLMCache:
+    """
+    Exact + semantic cache of LLM responses
+
+    The semantic layer is only consulted for plain prompts (no chat messages or
+    provider-specific parameters). At temperature 0 it uses ``semantic_threshold``;
+    sampled requests use ``sampled_semantic_threshold`` and skip the layer when it is None.
+    """
+
+    def __init__(
+        self,
+        vector_store: Optional["VectorStore"] = None,
+        ttl: float = 3600,
+        max_entries: int = 1024,
+        semantic_threshold: float = 0.95,
+        sampled_semantic_threshold: Optional[float] = None,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            vector_store: Store backing the semantic layer (None disables it)
+            ttl: Seconds a cached response stays valid
+            max_entries: Maximum number of exact-match entries kept in memory
+            semantic_threshold: Minimum cosine similarity for a semantic hit at temperature 0
+            sampled_semantic_threshold: Minimum cosine similarity for a semantic hit at temperature > 0
+        """
+        self.vector_store = vector_store
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.semantic_threshold = semantic_threshold
+        self.sampled_semantic_threshold = sampled_semantic_threshold
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> "LLMCache":
+        """Create a cache configured from application settings"""
+        vector_store = None
+        if settings.llm_cache_semantic_enabled:
+            from creative_autogpt.storage.vector_store import VectorStore
+            try:
+                vector_store = VectorStore(collection_name=LLM_CACHE_COLLECTION)
+            except Exception as e:
+                logger.warning(f"Semantic LLM cache disabled, vector store unavailable: {e}")
+
+        return cls(
+            vector_store=vector_store,
+            ttl=settings.llm_cache_ttl,
+            max_entries=settings.llm_cache_max_entries,
+            semantic_threshold=settings.llm_cache_semantic_threshold,
+            sampled_semantic_threshold=settings.llm_cache_sampled_semantic_threshold,
+        )
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        task_type: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        messages: Optional[List[Any]] = None,
+        **kwargs,
+    ) -> str:
+        """Compute the exact-match cache key for a request"""
+        payload = {
+            "prompt": prompt,
+            "task_type": task_type,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "messages": [m.to_dict() if hasattr(m, "to_dict") else m for m in messages] if messages else None,
+            **kwargs,
+        }
+        data = orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return hashlib.sha256(data).hexdigest()
+
+    def _semantic_threshold_for(self, temperature: float) -> Optional[float]:
+        """Similarity threshold for the semantic layer, or None if it should be skipped"""
+        if self.vector_store is None:
+            return None
+        return self.semantic_threshold if temperature == 0 else self.sampled_semantic_threshold
+
+    async def get(
+        self,
+        prompt: str,
+        task_type: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        messages: Optional[List[Any]] = None,
+        **kwargs,
+    ) -> Optional[LLMResponse]:
+        """
+        Look up a cached response
+
+        Args:
+            prompt: The prompt
+            task_type: The task type
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            messages: Optional chat messages
+            **kwargs: Additional request parameters (part of the exact key)
+
+        Returns:
+            Cached LLMResponse (marked as cached, tier set to the layer that hit), or None on a miss
+        """
+        key = self.make_key(prompt, task_type, temperature, max_tokens, messages, **kwargs)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, data = entry
+            if now - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                return _response_from_dict(data, ProviderTier.CACHE_L1)
+            del self._entries[key]
+
+        threshold = self._semantic_threshold_for(temperature)
+        if threshold is not None and not messages and not kwargs:
+            data = await self._semantic_get(prompt, task_type, max_tokens, threshold)
+            if data is not None:
+                self._remember(key, data)
+                self.stats["semantic_hits"] += 1
+                return _response_from_dict(data, ProviderTier.CACHE_L2)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(
+        self,
+        prompt: str,
+        task_type: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        response: LLMResponse,
+        messages: Optional[List[Any]] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Store a provider response in both layers
+
+        Args:
+            prompt: The prompt
+            task_type: The task type
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            response: The response to cache
+            messages: Optional chat messages
+            **kwargs: Additional request parameters (part of the exact key)
+        """
+        data = response.to_dict()
+        self._remember(self.make_key(prompt, task_type, temperature, max_tokens, messages, **kwargs), data)
+
+        if self._semantic_threshold_for(temperature) is not None and not messages and not kwargs:
+            await self._semantic_set(prompt, task_type, max_tokens, data)
+
+    async def has_similar(self, prompt: str, task_type: Optional[str], max_tokens: int) -> bool:
+        """Whether the semantic layer holds an unexpired entry within ``semantic_threshold`` of the prompt"""
+        if self.vector_store is None:
+            return False
+        return await self._semantic_get(prompt, task_type, max_tokens, self.semantic_threshold) is not None
+
+    async def prime(self, prompt: str, task_type: Optional[str], max_tokens: int, response: LLMResponse) -> None:
+        """
+        Store a response in the semantic layer only, for warming the cache ahead of real requests
+
+        Args:
+            prompt: The prompt
+            task_type: The task type
+            max_tokens: Maximum tokens of the requests that should hit this entry
+            response: The response to cache
+        """
+        if self.vector_store is not None:
+            await self._semantic_set(prompt, task_type, max_tokens, response.to_dict())
+
+    def clear(self) -> None:
+        """Drop all exact-match entries"""
+        self._entries.clear()
+
+    def _remember(self, key: str, data: Dict[str, Any]) -> None:
+        """Insert an exact-match entry, evicting the least recently used one if full"""
+        self._entries[key] = (time.monotonic(), data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def similar(
+        self,
+        prompt: str,
+        task_type: Optional[str],
+        max_tokens: int,
+        top_k: int = 3,
+    ) -> List[Tuple[str, str]]:
+        """
+        Find the cached exchanges closest to a prompt, regardless of the hit threshold
+
+        Args:
+            prompt: The prompt
+            task_type: The task type
+            max_tokens: Maximum tokens to generate
+            top_k: Maximum number of exchanges to return
+
+        Returns:
+            (prompt, response content) pairs of unexpired entries, closest first
+        """
+        if self.vector_store is None:
+            return []
+
+        now = time.time()
+        return [
+            (hit.item.content, orjson.loads(hit.item.metadata["response"])["content"])
+            for hit in await self._semantic_search(prompt, task_type, max_tokens, top_k)
+            if hit.item.content != prompt and now - float(hit.item.metadata.get("cached_at", 0)) < self.ttl
+        ]
+
+    async def _semantic_search(
+        self,
+        prompt: str,
+        task_type: Optional[str],
+        max_tokens: int,
+        top_k: int,
+    ) -> List[Any]:
+        """Search the semantic layer for prompts cached under the same task type and token limit"""
+        try:
+            return await self.vector_store.search(
+                query=prompt,
+                top_k=top_k,
+                where={"$and": [
+                    {"kind": "llm_cache"},
+                    {"task_type": task_type or ""},
+                    {"max_tokens": max_tokens},
+                ]},
+            )
+        except Exception as e:
+            logger.warning(f"Semantic LLM cache lookup failed: {e}")
+            return []
+
+    async def _semantic_get(
+        self,
+        prompt: str,
+        task_type: Optional[str],
+        max_tokens: int,
+        threshold: float,
+    ) -> Optional[Dict[str, Any]]:
+        """Find a cached response whose prompt is similar enough to this one"""
+        results = await self._semantic_search(prompt, task_type, max_tokens, top_k=1)
+        if not results or results[0].distance is None:
+            return None
+
+        hit = results[0]
+        # Embeddings are unit-normalized, so Chroma's squared L2 distance d gives cos = 1 - d / 2
+        similarity = 1.0 - hit.distance / 2
+        if similarity < threshold:
+            return None
+        # A zero distance between different prompts means embedding failed and fell back to zero vectors
+        if hit.distance == 0 and hit.item.content != prompt:
+            return None
+        if time.time() - float(hit.item.metadata.get("cached_at", 0)) >= self.ttl:
+            return None
+
+        logger.debug(f"Semantic LLM cache hit for task '{task_type}' (similarity {similarity:.3f})")
+        return orjson.loads(hit.item.metadata["response"])
+
+    async def _semantic_set(
+        self,
+        prompt: str,
+        task_type: Optional[str],
+        max_tokens: int,
+        data: Dict[str, Any],
+    ) -> None:
+        """Store a prompt and its response in the semantic layer"""
+        from creative_autogpt.storage.vector_store import MemoryType
+
+        try:
+            await self.vector_store.add(
+                content=prompt,
+                memory_type=MemoryType.GENERAL,
+                metadata={
+                    "kind": "llm_cache",
+                    "task_type": task_type or "",
+                    "max_tokens": max_tokens,
+                    "cached_at": time.time(),
+                    "response": orjson.dumps(data).decode(),
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store response in semantic LLM cache: {e}")
+
+
+def _response_from_dict(data: Dict[str, Any], tier: ProviderTier) -> LLMResponse:
+    """Rebuild an LLMResponse from LLMResponse.to_dict() output, marked as cached by the given tier"""
+    return LLMResponse.from_dict(data, cached=True, tier=tier)
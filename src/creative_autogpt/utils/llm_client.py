@@ -1,22 +1,26 @@
 """
 Multi-LLM Client with intelligent routing and fallback support
 
-Supports Aliyun (Qwen), DeepSeek, Ark (Doubao), and NVIDIA providers.
+Supports Aliyun (Qwen), DeepSeek, Ark (Doubao), NVIDIA, and local OpenAI-compatible providers.
 Implements task-type-based routing for optimal LLM selection.
 """
 
 import asyncio
 import time
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from loguru import logger
 from openai import AsyncOpenAI, APIError, APIConnectionError, RateLimitError
 
 from creative_autogpt.utils.config import get_settings
 
+if TYPE_CHECKING:
+    from creative_autogpt.utils.llm_cache import LLMCache
+
 
 class LLMProvider(str, Enum):
     """Supported LLM providers"""
@@ -25,6 +29,32 @@ class LLMProvider(str, Enum):
     DEEPSEEK = "deepseek"
     ARK = "ark"  # Doubao
     NVIDIA = "nvidia"
+    LOCAL = "local"  # OpenAI-compatible local server (Ollama, llama.cpp)
+
+
+class ProviderTier(str, Enum):
+    """Tiers MultiLLMClient.generate tries in order, cheapest first"""
+
+    CACHE_L1 = "cache_l1"  # Exact-match response cache
+    CACHE_L2 = "cache_l2"  # Semantic response cache
+    LOCAL_CHEAP = "local_cheap"  # Local model primed with similar cached responses
+    REMOTE_STRONG = "remote_strong"  # Routed remote provider with fallbacks
+
+
+# Tiers that served generate() calls in the current context (see track_provider_tiers)
+_served_tiers: ContextVar[Optional[List[ProviderTier]]] = ContextVar("served_tiers", default=None)
+
+
+def track_provider_tiers() -> List[ProviderTier]:
+    """
+    Start recording which tier serves each MultiLLMClient.generate call in the current context
+
+    Returns:
+        The list the tiers are appended to (shared with tasks spawned from this context)
+    """
+    tiers: List[ProviderTier] = []
+    _served_tiers.set(tiers)
+    return tiers
 
 
 @dataclass
@@ -54,6 +84,7 @@ class LLMResponse:
     raw_response: Optional[Dict[str, Any]] = None
     cached: bool = False
     generation_time: float = 0.0
+    tier: Optional[ProviderTier] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -63,8 +94,24 @@ class LLMResponse:
             "usage": self.usage.to_dict(),
             "cached": self.cached,
             "generation_time": self.generation_time,
+            "tier": self.tier.value if self.tier else None,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **overrides) -> "LLMResponse":
+        """Rebuild a response from to_dict() output, with optional field overrides"""
+        fields = {
+            "content": data["content"],
+            "model": data["model"],
+            "provider": LLMProvider(data["provider"]),
+            "usage": LLMUsage(**data["usage"]),
+            "cached": data.get("cached", False),
+            "generation_time": data["generation_time"],
+            "tier": ProviderTier(data["tier"]) if data.get("tier") else None,
+        }
+        fields.update(overrides)
+        return cls(**fields)
+
 
 @dataclass
 class LLMMessage:
@@ -108,6 +155,10 @@ class LLMClientBase(ABC):
         """Return the provider type"""
         pass
 
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        await self.client.close()
+
     @abstractmethod
     async def generate(
         self,
@@ -459,6 +510,66 @@ class NvidiaLLMClient(LLMClientBase):
         )
 
 
+class LocalLLMClient(LLMClientBase):
+    """Local LLM client - cheap tier served by an OpenAI-compatible server (Ollama, llama.cpp)"""
+
+    def __init__(
+        self,
+        api_key: str = "local",
+        base_url: str = "http://localhost:11434/v1",
+        model: str = "qwen2.5:7b",
+        **kwargs,
+    ):
+        super().__init__(api_key=api_key, base_url=base_url, model=model, **kwargs)
+
+    @property
+    def provider(self) -> LLMProvider:
+        return LLMProvider.LOCAL
+
+    async def generate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        messages: Optional[List[LLMMessage]] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        """Generate text using the local model"""
+
+        start_time = time.time()
+
+        # Build messages
+        if messages is None:
+            messages = [LLMMessage(role="user", content=prompt)]
+
+        message_dicts = [m.to_dict() for m in messages]
+
+        logger.debug(f"Generating with {self.provider.value}, prompt length: {len(prompt)}")
+
+        content, usage, raw = await self._generate_with_retry(
+            messages=message_dicts,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+
+        generation_time = time.time() - start_time
+
+        logger.info(
+            f"Generated {len(content)} chars with {self.provider.value} "
+            f"in {generation_time:.2f}s, tokens: {usage.total_tokens}"
+        )
+
+        return LLMResponse(
+            content=content,
+            model=self.model,
+            provider=self.provider,
+            usage=usage,
+            raw_response=raw,
+            generation_time=generation_time,
+        )
+
+
 class MultiLLMClient:
     """
     Multi-LLM client with intelligent task-type routing
@@ -467,6 +578,9 @@ class MultiLLMClient:
     - Qwen Long (Aliyun): 所有任务统一使用 Qwen Long，通过优化的提示词直接生成高质量内容
     - DeepSeek: 备用提供商（推理能力强）
     - Doubao (Ark): 备用提供商
+
+    Requests go through a tier hierarchy (see ProviderTier): exact cache, semantic
+    cache, an optional local model for ``local_task_types``, then the remote providers.
     """
 
     # Default task type routing map
@@ -518,6 +632,9 @@ class MultiLLMClient:
         task_type_map: Optional[Dict[str, LLMProvider]] = None,
         default_provider: LLMProvider = LLMProvider.ALIYUN,
         fallback_order: Optional[List[LLMProvider]] = None,
+        cache: Optional["LLMCache"] = None,
+        local_task_types: Optional[List[str]] = None,
+        few_shot_examples: Optional[int] = None,
     ):
         """
         Initialize multi-LLM client
@@ -527,6 +644,9 @@ class MultiLLMClient:
             task_type_map: Custom task type routing map
             default_provider: Default provider if task type not found
             fallback_order: Fallback order for failed requests
+            cache: Optional response cache consulted before calling a provider
+            local_task_types: Task types tried on the local provider before the remote ones
+            few_shot_examples: Similar cached responses prepended as examples for the local provider
         """
         settings = get_settings()
 
@@ -555,6 +675,19 @@ class MultiLLMClient:
         # Remove providers that aren't available from fallback order
         self.fallback_order = [p for p in self.fallback_order if p in self.providers]
 
+        self.cache = cache
+
+        # Cheap tier: only used for these task types, and only if a local provider exists
+        self.local_task_types = set(
+            settings.local_llm_task_types if local_task_types is None else local_task_types
+        )
+        self.few_shot_examples = (
+            settings.local_llm_few_shot_examples if few_shot_examples is None else few_shot_examples
+        )
+
+        # Number of generate() calls served by each tier
+        self.tier_stats: Dict[str, int] = {tier.value: 0 for tier in ProviderTier}
+
         logger.info(
             f"MultiLLMClient initialized with providers: {list(self.providers.keys())}"
         )
@@ -626,6 +759,20 @@ class MultiLLMClient:
         else:
             providers.append(None)
 
+        # Local model (optional cheap tier)
+        if settings.local_llm_enabled:
+            providers.append(
+                LocalLLMClient(
+                    base_url=settings.local_llm_base_url,
+                    model=settings.local_llm_model,
+                    timeout=settings.llm_request_timeout,
+                    max_retries=settings.max_retries,
+                )
+            )
+            logger.info("Local LLM provider enabled")
+        else:
+            providers.append(None)
+
         return [p for p in providers if p is not None]
 
     def _select_provider(self, task_type: Optional[str]) -> LLMProvider:
@@ -699,6 +846,7 @@ class MultiLLMClient:
         max_tokens: int = 4000,
         messages: Optional[List[LLMMessage]] = None,
         llm: Optional[str] = None,
+        use_cache: bool = True,
         **kwargs,
     ) -> LLMResponse:
         """
@@ -711,6 +859,8 @@ class MultiLLMClient:
             max_tokens: Maximum tokens to generate
             messages: Optional list of messages for chat completion
             llm: Override LLM selection (provider name)
+            use_cache: Read and write the response cache (False for requests that must
+                produce a fresh sample, e.g. regenerating existing content)
             **kwargs: Additional parameters
 
         Returns:
@@ -719,6 +869,24 @@ class MultiLLMClient:
         Raises:
             APIError: If all providers fail
         """
+        cache = self.cache if use_cache else None
+        cache_kwargs = {**kwargs, "llm": llm} if llm else kwargs
+        if cache is not None:
+            cached = await cache.get(prompt, task_type, temperature, max_tokens, messages, **cache_kwargs)
+            if cached is not None:
+                logger.info(f"Serving task '{task_type}' from LLM cache ({cached.tier.value})")
+                return self._record_tier(cached)
+
+        # Cheap tier: a local model primed with similar cached responses
+        if not llm and task_type in self.local_task_types and LLMProvider.LOCAL in self.providers:
+            response = await self._generate_local(prompt, task_type, temperature, max_tokens, messages, **kwargs)
+            if response is not None:
+                if cache is not None:
+                    await cache.set(
+                        prompt, task_type, temperature, max_tokens, response, messages, **cache_kwargs
+                    )
+                return self._record_tier(response)
+
         # Select provider
         if llm:
             # Manual override
@@ -749,7 +917,14 @@ class MultiLLMClient:
                     messages=messages,
                     **kwargs,
                 )
-                return response
+                response.tier = (
+                    ProviderTier.LOCAL_CHEAP if provider == LLMProvider.LOCAL else ProviderTier.REMOTE_STRONG
+                )
+                if cache is not None:
+                    await cache.set(
+                        prompt, task_type, temperature, max_tokens, response, messages, **cache_kwargs
+                    )
+                return self._record_tier(response)
 
             except Exception as e:
                 last_error = e
@@ -763,6 +938,59 @@ class MultiLLMClient:
             f"All providers failed for task '{task_type}': {last_error}"
         )
 
+    async def _generate_local(
+        self,
+        prompt: str,
+        task_type: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        messages: Optional[List[LLMMessage]] = None,
+        **kwargs,
+    ) -> Optional[LLMResponse]:
+        """
+        Try the local provider, with similar cached exchanges prepended as few-shot examples
+
+        Returns:
+            The local response, or None if the local provider failed
+        """
+        if messages is None:
+            messages = [LLMMessage(role="user", content=prompt)]
+            if self.cache is not None and self.few_shot_examples > 0:
+                examples = await self.cache.similar(prompt, task_type, max_tokens, top_k=self.few_shot_examples)
+                messages = [
+                    message
+                    for example_prompt, example_response in examples
+                    for message in (
+                        LLMMessage(role="user", content=example_prompt),
+                        LLMMessage(role="assistant", content=example_response),
+                    )
+                ] + messages
+
+        try:
+            logger.info(f"Generating with {LLMProvider.LOCAL.value} for task '{task_type}'")
+            response = await self.providers[LLMProvider.LOCAL].generate(
+                prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                messages=messages,
+                **kwargs,
+            )
+        except Exception as e:
+            logger.warning(f"Local provider failed for task '{task_type}', using remote providers: {e}")
+            return None
+
+        response.tier = ProviderTier.LOCAL_CHEAP
+        return response
+
+    def _record_tier(self, response: LLMResponse) -> LLMResponse:
+        """Count the tier that served a response and report it to the current context"""
+        if response.tier is not None:
+            self.tier_stats[response.tier.value] += 1
+            served = _served_tiers.get()
+            if served is not None:
+                served.append(response.tier)
+        return response
+
     async def generate_stream(
         self,
         prompt: str,
@@ -771,7 +999,7 @@ class MultiLLMClient:
         max_tokens: int = 4000,
         messages: Optional[List[LLMMessage]] = None,
         **kwargs,
-    ):
+    ) -> AsyncIterator[str]:
         """
         Generate text with streaming response
 
@@ -786,8 +1014,13 @@ class MultiLLMClient:
         Yields:
             Chunks of generated text
         """
-        # Select provider
+        # Select provider (the routed one if available, otherwise the first fallback)
         primary_provider = self._select_provider(task_type)
+        candidates = [primary_provider] + self._get_fallback_order(primary_provider)
+        available = [p for p in candidates if p in self.providers]
+        if not available:
+            raise Exception(f"No provider available for task '{task_type}'")
+        primary_provider = available[0]
         client = self.providers[primary_provider]
 
         # Build messages
@@ -799,8 +1032,8 @@ class MultiLLMClient:
         logger.info(f"Streaming with {primary_provider.value} for task '{task_type}'")
 
         try:
-            stream = await self.client.chat.completions.create(
-                model=self.model,
+            stream = await client.client.chat.completions.create(
+                model=client.model,
                 messages=message_dicts,
                 temperature=temperature,
                 max_tokens=max_tokens,
@@ -809,13 +1042,21 @@ class MultiLLMClient:
             )
 
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
 
         except Exception as e:
             logger.error(f"Streaming failed for {primary_provider.value}: {e}")
             raise
 
+    async def close(self) -> None:
+        """Close the HTTP connection pools of all providers"""
+        for client in self.providers.values():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close {client.provider.value} client: {e}")
+
     def get_available_providers(self) -> List[str]:
         """Get list of available provider names"""
         return [p.value for p in self.providers.keys()]
@@ -0,0 +1,144 @@
+"""
+Record/replay LLM client for tests
+
+VCR-style wrapper around MultiLLMClient: in ``record`` mode every response is
+written to a JSON cassette keyed by a SHA-256 of the request, and in ``replay``
+mode responses are served from those cassettes without touching the network.
+
+Enable with:
+    CREATIVE_AUTOGPT_TEST_MODE=record python scripts/test_system.py
+    CREATIVE_AUTOGPT_TEST_MODE=replay python scripts/test_system.py
+"""
+
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import orjson
+from loguru import logger
+
+from creative_autogpt.utils.llm_cache import LLMCache
+from creative_autogpt.utils.llm_client import LLMMessage, LLMResponse, MultiLLMClient
+
+
+class LLMTestMode(str, Enum):
+    """How the test harness obtains LLM responses"""
+
+    LIVE = "live"  # Always call providers
+    RECORD = "record"  # Call providers and save each response as a cassette
+    REPLAY = "replay"  # Serve responses from cassettes only
+
+
+class CassetteNotFoundError(LookupError):
+    """Raised in replay mode when a request has no recorded cassette"""
+
+
+class RecordReplayLLMClient(MultiLLMClient):
+    """
+    MultiLLMClient that records responses to, or replays them from, cassette files
+
+    The cassette key covers the prompt, task type, temperature, max tokens,
+    chat messages and any extra parameters, so only identical requests replay.
+    """
+
+    def __init__(self, cassette_dir: str, mode: LLMTestMode = LLMTestMode.REPLAY, **kwargs):
+        """
+        Initialize the client
+
+        Args:
+            cassette_dir: Directory holding the ``<key>.json`` cassettes
+            mode: RECORD or REPLAY (LIVE behaves like a plain MultiLLMClient)
+            **kwargs: Passed to MultiLLMClient
+        """
+        super().__init__(**kwargs)
+        self.cassette_dir = Path(cassette_dir)
+        self.mode = LLMTestMode(mode)
+        logger.info(f"LLM test mode '{self.mode.value}' using cassettes in {self.cassette_dir}")
+
+    def _cassette_path(
+        self,
+        prompt: str,
+        task_type: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        messages: Optional[List[LLMMessage]] = None,
+        **kwargs,
+    ) -> Path:
+        """Path of the cassette for a request"""
+        key = LLMCache.make_key(prompt, task_type, temperature, max_tokens, messages, **kwargs)
+        return self.cassette_dir / f"{key}.json"
+
+    def _load(self, path: Path, task_type: Optional[str]) -> Dict[str, Any]:
+        """Read a cassette, failing loudly if it was never recorded"""
+        try:
+            return orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            raise CassetteNotFoundError(
+                f"No cassette for task '{task_type}' ({path.name}); "
+                f"run once with CREATIVE_AUTOGPT_TEST_MODE=record"
+            ) from None
+
+    def _save(self, path: Path, data: Dict[str, Any]) -> None:
+        """Write a cassette"""
+        self.cassette_dir.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+    async def generate(
+        self,
+        prompt: str,
+        task_type: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        messages: Optional[List[LLMMessage]] = None,
+        llm: Optional[str] = None,
+        use_cache: bool = True,
+        **kwargs,
+    ) -> LLMResponse:
+        """Generate text, recording or replaying the response depending on the mode"""
+        if self.mode == LLMTestMode.LIVE:
+            return await super().generate(
+                prompt, task_type, temperature, max_tokens, messages=messages, llm=llm, use_cache=use_cache, **kwargs
+            )
+
+        cassette_kwargs = {**kwargs, "llm": llm} if llm else kwargs
+        path = self._cassette_path(prompt, task_type, temperature, max_tokens, messages, **cassette_kwargs)
+
+        if self.mode == LLMTestMode.REPLAY:
+            return LLMResponse.from_dict(self._load(path, task_type))
+
+        response = await super().generate(
+            prompt, task_type, temperature, max_tokens, messages=messages, llm=llm, use_cache=use_cache, **kwargs
+        )
+        self._save(path, response.to_dict())
+        return response
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        task_type: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        messages: Optional[List[LLMMessage]] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """Stream text; replayed streams yield the recorded content as a single chunk"""
+        if self.mode == LLMTestMode.LIVE:
+            async for chunk in super().generate_stream(
+                prompt, task_type, temperature, max_tokens, messages=messages, **kwargs
+            ):
+                yield chunk
+            return
+
+        path = self._cassette_path(prompt, task_type, temperature, max_tokens, messages, stream=True, **kwargs)
+
+        if self.mode == LLMTestMode.REPLAY:
+            yield self._load(path, task_type)["content"]
+            return
+
+        chunks = []
+        async for chunk in super().generate_stream(
+            prompt, task_type, temperature, max_tokens, messages=messages, **kwargs
+        ):
+            chunks.append(chunk)
+            yield chunk
+        self._save(path, {"content": "".join(chunks)})
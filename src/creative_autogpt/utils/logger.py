@@ -7,21 +7,29 @@ from typing import Optional
 
 from creative_autogpt.utils.config import get_settings
 
+# Options of the current logger configuration (None until setup_logger runs)
+_configured_options: Optional[tuple] = None
+
 
 def setup_logger(
     log_level: Optional[str] = None,
     log_file: Optional[str] = None,
     rotation: Optional[str] = None,
     retention: Optional[str] = None,
+    enqueue: bool = False,
 ) -> None:
     """
     Configure loguru logger for the application
 
+    Repeated calls with the same options are no-ops.
+
     Args:
         log_level: Log level (DEBUG, INFO, WARNING, ERROR)
         log_file: Path to log file
         rotation: Log rotation configuration
         retention: Log retention configuration
+        enqueue: Hand records to a background thread instead of writing them
+            in the caller (keeps sink I/O off the asyncio event loop)
     """
     settings = get_settings()
 
@@ -30,6 +38,13 @@ def setup_logger(
     rotation = rotation or settings.log_rotation
     retention = retention or settings.log_retention
 
+    # Already configured with the same options: skip rebuilding the handlers
+    global _configured_options
+    options = (log_level, log_file, rotation, retention, enqueue)
+    if options == _configured_options:
+        return
+    _configured_options = options
+
     # Remove default handler
     _logger.remove()
 
@@ -44,6 +59,7 @@ def setup_logger(
         ),
         level=log_level,
         colorize=True,
+        enqueue=enqueue,
     )
 
     # File handler
@@ -65,6 +81,7 @@ def setup_logger(
             compression="zip",
             backtrace=True,
             diagnose=True,
+            enqueue=enqueue,
         )
 
     _logger.info(f"Logger initialized with level: {log_level}")
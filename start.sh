@@ -59,7 +59,7 @@ echo ""
 # 启动后端
 echo "🔧 启动后端服务 (Port 8000)..."
 cd "$PROJECT_DIR"
-PYTHONPATH=src uvicorn creative_autogpt.api.main:app --host 0.0.0.0 --port 8000 --reload &
+PYTHONPATH=src uvicorn creative_autogpt.api.main:app --host 0.0.0.0 --port 8000 --reload --loop uvloop --http httptools &
 BACKEND_PID=$!
 echo "  后端 PID: $BACKEND_PID"
 
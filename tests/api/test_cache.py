@@ -0,0 +1,195 @@
+"""
+API 进程内缓存测试
+"""
+
+import asyncio
+
+import pytest
+
+from creative_autogpt.api import cache as cache_module
+from creative_autogpt.api.cache import MemoryManagerPool, SessionCache
+
+
+class _FakeClock:
+    """替换 cache 模块中的 time，手动推进时间"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class _FakeStorage:
+    """记录读取次数的假存储；设置 gate 后读取会等待放行"""
+
+    def __init__(self):
+        self.sessions = {"s1": {"id": "s1", "title": "v1"}, "s2": {"id": "s2"}, "s3": {"id": "s3"}}
+        self.reads = 0
+        self.gate = None
+
+    async def get_session(self, session_id):
+        self.reads += 1
+        snapshot = dict(self.sessions[session_id]) if session_id in self.sessions else None
+        if self.gate is not None:
+            await self.gate.wait()
+        return snapshot
+
+
+async def _settle():
+    """让已调度的任务运行到各自的等待点"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestSessionCache:
+    """SessionCache 测试"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = _FakeClock()
+        monkeypatch.setattr(cache_module, "time", clock)
+        return clock
+
+    @pytest.fixture
+    def storage(self):
+        return _FakeStorage()
+
+    @pytest.mark.asyncio
+    async def test_served_from_cache_until_ttl(self, clock, storage):
+        cache = SessionCache(ttl=2.0)
+
+        assert (await cache.get(storage, "s1"))["title"] == "v1"
+        storage.sessions["s1"]["title"] = "v2"
+
+        clock.now += 1.9
+        assert (await cache.get(storage, "s1"))["title"] == "v1"
+        assert storage.reads == 1
+
+        clock.now += 0.1
+        assert (await cache.get(storage, "s1"))["title"] == "v2"
+        assert storage.reads == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_session_not_cached(self, clock, storage):
+        cache = SessionCache()
+
+        assert await cache.get(storage, "missing") is None
+        assert await cache.get(storage, "missing") is None
+        assert storage.reads == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_read(self, clock, storage):
+        cache = SessionCache()
+        storage.gate = asyncio.Event()
+
+        waiters = [asyncio.ensure_future(cache.get(storage, "s1")) for _ in range(5)]
+        await _settle()
+        storage.gate.set()
+        results = await asyncio.gather(*waiters)
+
+        assert storage.reads == 1
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_read(self, clock, storage):
+        cache = SessionCache()
+        storage.gate = asyncio.Event()
+
+        cancelled = asyncio.ensure_future(cache.get(storage, "s1"))
+        other = asyncio.ensure_future(cache.get(storage, "s1"))
+        await _settle()
+        cancelled.cancel()
+        storage.gate.set()
+
+        assert (await other)["title"] == "v1"
+        assert storage.reads == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_load_discards_stale_result(self, clock, storage):
+        """读取进行中被 invalidate 时，旧结果不写入缓存，之后的调用重新读取"""
+        cache = SessionCache()
+        storage.gate = asyncio.Event()
+
+        stale = asyncio.ensure_future(cache.get(storage, "s1"))
+        await _settle()
+
+        # 写入方更新会话后失效缓存
+        storage.sessions["s1"]["title"] = "v2"
+        cache.invalidate("s1")
+
+        fresh = asyncio.ensure_future(cache.get(storage, "s1"))
+        await _settle()
+        storage.gate.set()
+
+        assert (await stale)["title"] == "v1"
+        assert (await fresh)["title"] == "v2"
+        assert storage.reads == 2
+
+        storage.gate = None
+        assert (await cache.get(storage, "s1"))["title"] == "v2"
+        assert storage.reads == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_during_load_discards_result(self, clock, storage):
+        cache = SessionCache()
+        storage.gate = asyncio.Event()
+
+        loading = asyncio.ensure_future(cache.get(storage, "s1"))
+        await _settle()
+        cache.clear()
+        storage.gate.set()
+        await loading
+
+        storage.gate = None
+        await cache.get(storage, "s1")
+        assert storage.reads == 2
+
+    @pytest.mark.asyncio
+    async def test_oldest_entry_evicted_when_full(self, clock, storage):
+        cache = SessionCache(max_entries=2)
+
+        for session_id in ("s1", "s2", "s3"):
+            await cache.get(storage, session_id)
+        assert storage.reads == 3
+
+        await cache.get(storage, "s3")
+        await cache.get(storage, "s2")
+        assert storage.reads == 3
+
+        await cache.get(storage, "s1")
+        assert storage.reads == 4
+
+
+class _FakeMemoryManager:
+    def __init__(self, session_id=None):
+        self.session_id = session_id
+
+
+class TestMemoryManagerPool:
+    """MemoryManagerPool 测试"""
+
+    @pytest.fixture(autouse=True)
+    def fake_memory(self, monkeypatch):
+        monkeypatch.setattr("creative_autogpt.api.dependencies.create_memory_manager", _FakeMemoryManager)
+
+    def test_reuses_manager_per_session(self):
+        pool = MemoryManagerPool()
+
+        memory = pool.get("s1")
+
+        assert pool.get("s1") is memory
+        assert memory.session_id == "s1"
+        assert pool.get("s2") is not memory
+
+    def test_least_recently_used_session_evicted(self):
+        pool = MemoryManagerPool(max_sessions=2)
+        s1 = pool.get("s1")
+        s2 = pool.get("s2")
+
+        # 访问 s1 后加入 s3，应淘汰 s2
+        pool.get("s1")
+        pool.get("s3")
+
+        assert pool.get("s1") is s1
+        assert pool.get("s2") is not s2
@@ -0,0 +1,186 @@
+"""
+启动时 LLM 缓存预热测试
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+
+from creative_autogpt.api import main as main_module
+from creative_autogpt.api.main import lifespan, warm_llm_cache
+from creative_autogpt.core.loop_engine import LoopEngine
+from creative_autogpt.core.task_planner import NovelTaskType
+from creative_autogpt.core.vector_memory import MemoryContext
+from creative_autogpt.modes.novel import NovelMode
+from creative_autogpt.storage.vector_store import MemoryType, SearchResult, VectorMemoryItem
+from creative_autogpt.utils.config import Settings
+from creative_autogpt.utils.llm_cache import LLMCache
+from creative_autogpt.utils.llm_client import (
+    LLMProvider,
+    LLMResponse,
+    LLMUsage,
+    MultiLLMClient,
+    ProviderTier,
+)
+
+
+class _StubVectorStore:
+    """语义层的假向量库：按 where 过滤，同一提示词距离为 0，其余距离较大"""
+
+    def __init__(self):
+        self.items = []
+
+    async def add(self, content, memory_type=MemoryType.GENERAL, metadata=None, **kwargs):
+        self.items.append(VectorMemoryItem(
+            id=str(len(self.items)), content=content, memory_type=memory_type, metadata=metadata or {},
+        ))
+        return self.items[-1].id
+
+    async def search(self, query, top_k=5, where=None, **kwargs):
+        conditions = where["$and"] if where else []
+        matches = [
+            SearchResult(item=item, score=0.0, distance=0.0 if item.content == query else 1.0)
+            for item in self.items
+            if all(item.metadata.get(k) == v for condition in conditions for k, v in condition.items())
+        ]
+        return sorted(matches, key=lambda result: result.distance)[:top_k]
+
+
+class _CountingProvider:
+    """记录调用次数的假提供商"""
+
+    provider = LLMProvider.DEEPSEEK
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt, temperature=0.7, max_tokens=4000, messages=None, **kwargs):
+        self.calls += 1
+        return LLMResponse(
+            content=f"预热 #{self.calls}",
+            model="fake",
+            provider=self.provider,
+            usage=LLMUsage(prompt_tokens=1, completion_tokens=1, total_tokens=2),
+        )
+
+
+async def _engine_request(client: MultiLLMClient, task_type: str, genre: str) -> LLMResponse:
+    """按 LoopEngine 的温度和 max_tokens 发出一个上下文为空的请求"""
+    context = MemoryContext(task_id="session_task", task_type=task_type)
+    prompt = await NovelMode(config={"genre": genre}).build_prompt(
+        task_type=task_type, context=context, metadata={"genre": genre}
+    )
+    engine_task_type = NovelTaskType(task_type)
+    return await client.generate(
+        prompt=prompt,
+        task_type=task_type,
+        temperature=LoopEngine._get_temperature_for_task(engine_task_type),
+        max_tokens=LoopEngine._get_max_tokens_for_task(engine_task_type),
+    )
+
+
+class TestWarmLLMCache:
+    """warm_llm_cache 测试"""
+
+    @pytest.fixture
+    def settings(self):
+        return Settings(prefetch_genres=["科幻"], prefetch_task_types=["大纲", "人物设计"])
+
+    @pytest.fixture
+    def provider(self):
+        return _CountingProvider()
+
+    def _client(self, provider, cache):
+        return MultiLLMClient(providers=[provider], cache=cache, local_task_types=[])
+
+    @pytest.mark.asyncio
+    async def test_engine_request_hits_warmed_entry(self, settings, provider):
+        cache = LLMCache(vector_store=_StubVectorStore(), sampled_semantic_threshold=0.9)
+        client = self._client(provider, cache)
+
+        await warm_llm_cache(client, settings)
+
+        assert provider.calls == 2
+        # 只写入语义层
+        assert not cache._entries
+
+        response = await _engine_request(client, "大纲", "科幻")
+
+        assert response.tier == ProviderTier.CACHE_L2
+        assert response.cached
+        assert provider.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_restart_does_not_regenerate(self, settings, provider):
+        cache = LLMCache(vector_store=_StubVectorStore(), sampled_semantic_threshold=0.9)
+
+        await warm_llm_cache(self._client(provider, cache), settings)
+        await warm_llm_cache(self._client(provider, cache), settings)
+
+        assert provider.calls == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cache_factory", [
+        lambda: None,
+        lambda: LLMCache(sampled_semantic_threshold=0.9),
+        lambda: LLMCache(vector_store=_StubVectorStore()),
+    ])
+    async def test_skipped_when_engine_requests_cannot_hit(self, settings, provider, cache_factory):
+        await warm_llm_cache(self._client(provider, cache_factory()), settings)
+
+        assert provider.calls == 0
+
+
+class _FakeRegistry:
+    def set_storage(self, storage):
+        pass
+
+    async def restore_session_on_startup(self):
+        return 0
+
+    async def shutdown(self):
+        pass
+
+
+class TestLifespanPrefetch:
+    """应用关闭时的预热任务处理"""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_finishes_before_services_close(self, monkeypatch):
+        events = []
+        started = asyncio.Event()
+
+        async def fake_warm(llm_client, settings):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                # 模拟取消时仍需等待一次进行中的调用返回
+                await asyncio.sleep(0)
+                events.append("warm_up_cancelled")
+                raise
+
+        async def fake_init(app):
+            app.state.session_storage = None
+            app.state.llm_client = None
+
+        async def fake_close(app):
+            events.append("services_closed")
+
+        async def fake_get_registry():
+            return _FakeRegistry()
+
+        settings = Settings(prefetch_enabled=True, llm_cache_enabled=True)
+        monkeypatch.setattr(main_module, "get_settings", lambda: settings)
+        monkeypatch.setattr(main_module, "setup_logger", lambda **kwargs: None)
+        monkeypatch.setattr(main_module, "init_app_state", fake_init)
+        monkeypatch.setattr(main_module, "close_app_state", fake_close)
+        monkeypatch.setattr(main_module, "warm_llm_cache", fake_warm)
+        monkeypatch.setattr("creative_autogpt.core.engine_registry.get_registry", fake_get_registry)
+
+        async with lifespan(FastAPI()):
+            await started.wait()
+
+        assert events == ["warm_up_cancelled", "services_closed"]
@@ -108,6 +108,13 @@ class TestChapterRewriter:
         mock_evaluator.evaluate.assert_called_once()
         mock_storage.create_chapter_version.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_rewrite_bypasses_llm_cache(self, rewriter, mock_llm_client):
+        """重写请求不走 LLM 响应缓存，重复重写也会重新生成"""
+        await rewriter.rewrite_chapter(chapter_index=1, reason="质量不够好", max_retries=1)
+
+        assert mock_llm_client.generate.call_args.kwargs["use_cache"] is False
+
     @pytest.mark.asyncio
     async def test_rewrite_chapter_with_retries(self, rewriter, mock_evaluator, mock_storage):
         """测试章节重写带重试"""
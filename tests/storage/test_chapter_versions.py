@@ -3,8 +3,13 @@
 """
 
 import pytest
+import pytest_asyncio
 from unittest.mock import Mock, AsyncMock, patch
-from creative_autogpt.storage.session import SessionStorage, ChapterVersionModel
+from creative_autogpt.storage.session import (
+    CHAPTER_VERSION_SUMMARY_FIELDS,
+    ChapterVersionModel,
+    SessionStorage,
+)
 
 
 class TestChapterVersionManagement:
@@ -157,5 +162,100 @@ class TestChapterVersionManagement:
         assert success is True
 
 
+class TestChapterVersionQueries:
+    """章节版本批量查询、截取与字段投影测试"""
+
+    @pytest_asyncio.fixture
+    async def storage(self):
+        """内存数据库存储实例，预置两章共 7 个版本"""
+        storage = SessionStorage("sqlite+aiosqlite:///:memory:")
+        await storage.initialize()
+
+        async with storage.session_factory() as session:
+            # 第1章：v1..v5，当前版本为 v1（不在最近3个版本内）
+            # 第2章：v1..v2，当前版本为 v2
+            for chapter_index, count, current in ((1, 5, 1), (2, 2, 2)):
+                for number in range(1, count + 1):
+                    session.add(ChapterVersionModel(
+                        id=f"c{chapter_index}v{number}",
+                        session_id="s1",
+                        task_id=f"task_{chapter_index}",
+                        chapter_index=chapter_index,
+                        version_number=number,
+                        is_current=number == current,
+                        content=f"第{chapter_index}章 v{number}",
+                        score=number / 10,
+                    ))
+            await session.commit()
+
+        yield storage
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_all_versions_limit_per_chapter(self, storage):
+        """limit 按章节分别截取，total 为截取前的版本总数"""
+        chapters = await storage.get_all_chapter_versions(
+            "s1", limit=3, fields=CHAPTER_VERSION_SUMMARY_FIELDS
+        )
+
+        assert [v["version_number"] for v in chapters[1]["versions"]] == [5, 4, 3]
+        assert [v["version_number"] for v in chapters[2]["versions"]] == [2, 1]
+        assert chapters[1]["total"] == 5
+        assert chapters[2]["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_all_versions_current_outside_limit(self, storage):
+        """当前版本不在截取范围内时仍返回完整的当前版本"""
+        chapters = await storage.get_all_chapter_versions(
+            "s1", limit=3, fields=CHAPTER_VERSION_SUMMARY_FIELDS
+        )
+
+        current = chapters[1]["current"]
+        assert current["id"] == "c1v1"
+        assert current["content"] == "第1章 v1"
+        assert chapters[2]["current"]["id"] == "c2v2"
+
+    @pytest.mark.asyncio
+    async def test_all_versions_summary_keys(self, storage):
+        """指定摘要字段时版本列表只包含这些字段"""
+        chapters = await storage.get_all_chapter_versions(
+            "s1", limit=3, fields=CHAPTER_VERSION_SUMMARY_FIELDS
+        )
+
+        version = chapters[1]["versions"][0]
+        assert list(version) == CHAPTER_VERSION_SUMMARY_FIELDS
+        assert version["is_current"] is False
+        assert version["score"] == 0.5
+        assert isinstance(version["created_at"], str)
+
+    @pytest.mark.asyncio
+    async def test_all_versions_full_records(self, storage):
+        """不指定 limit/fields 时返回全部版本的完整信息"""
+        chapters = await storage.get_all_chapter_versions("s1")
+
+        assert len(chapters[1]["versions"]) == 5
+        assert chapters[1]["versions"][0]["content"] == "第1章 v5"
+        assert "token_stats" in chapters[1]["versions"][0]
+
+    @pytest.mark.asyncio
+    async def test_get_chapter_versions_limit_and_fields(self, storage):
+        """单章查询同样支持 limit 和字段投影"""
+        versions = await storage.get_chapter_versions("s1", 1, limit=2, fields=["id", "version_number"])
+
+        assert versions == [
+            {"id": "c1v5", "version_number": 5},
+            {"id": "c1v4", "version_number": 4},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unknown_field_raises(self, storage):
+        """未知字段名抛出 ValueError"""
+        with pytest.raises(ValueError):
+            await storage.get_chapter_versions("s1", 1, fields=["id", "no_such_column"])
+
+        with pytest.raises(ValueError):
+            await storage.get_all_chapter_versions("s1", fields=["no_such_column"])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,85 @@
+"""
+会话配置局部更新测试
+"""
+
+import pytest
+import pytest_asyncio
+
+from creative_autogpt.storage.session import SessionStorage
+
+
+class TestPatchSessionConfig:
+    """patch_session_config 测试"""
+
+    @pytest_asyncio.fixture
+    async def storage(self):
+        """内存数据库存储实例"""
+        storage = SessionStorage("sqlite+aiosqlite:///:memory:")
+        await storage.initialize()
+        yield storage
+        await storage.close()
+
+    @pytest_asyncio.fixture
+    async def session_id(self, storage):
+        """带已有配置的会话"""
+        return await storage.create_session(
+            title="测试会话",
+            config={"model": "qwen", "derivative": {"type": "sequel"}},
+        )
+
+    async def _config(self, storage, session_id):
+        return (await storage.get_session(session_id))["config"]
+
+    @pytest.mark.asyncio
+    async def test_set_nested_value_keeps_other_keys(self, storage, session_id):
+        """设置嵌套值，其他配置键保持不变"""
+        derivative = {"type": "spinoff", "elements": ["a", "b"], "extra": {"tone": "dark", "count": 2}}
+
+        assert await storage.patch_session_config(session_id, updates={"derivative": derivative}) is True
+
+        config = await self._config(storage, session_id)
+        assert config == {"model": "qwen", "derivative": derivative}
+
+    @pytest.mark.asyncio
+    async def test_key_containing_dot(self, storage, session_id):
+        """键名中的 . 不被当作路径分隔符"""
+        await storage.patch_session_config(session_id, updates={"a.b": 1})
+
+        config = await self._config(storage, session_id)
+        assert config["a.b"] == 1
+        assert "a" not in config
+
+        await storage.patch_session_config(session_id, remove=["a.b"])
+        assert "a.b" not in await self._config(storage, session_id)
+
+    @pytest.mark.asyncio
+    async def test_key_containing_quote_rejected(self, storage, session_id):
+        """键名中的双引号无法写成 JSON 路径，直接拒绝"""
+        with pytest.raises(ValueError):
+            await storage.patch_session_config(session_id, updates={'a"b': 1})
+
+    @pytest.mark.asyncio
+    async def test_remove_key(self, storage, session_id):
+        """删除键，其他配置键保持不变"""
+        await storage.patch_session_config(session_id, remove=["derivative"])
+
+        assert await self._config(storage, session_id) == {"model": "qwen"}
+
+    @pytest.mark.asyncio
+    async def test_set_on_empty_config(self, storage):
+        """会话没有配置时从空对象开始"""
+        session_id = await storage.create_session(title="空配置")
+
+        await storage.patch_session_config(session_id, updates={"derivative": {"type": "sequel"}})
+
+        assert await self._config(storage, session_id) == {"derivative": {"type": "sequel"}}
+
+    @pytest.mark.asyncio
+    async def test_missing_session_returns_false(self, storage):
+        """会话不存在时返回 False"""
+        assert await storage.patch_session_config("missing", updates={"x": 1}) is False
+        assert await storage.patch_session_config("missing", remove=["x"]) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
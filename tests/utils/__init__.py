@@ -0,0 +1 @@
+"""测试初始化文件"""
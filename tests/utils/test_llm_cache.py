@@ -0,0 +1,279 @@
+"""
+LLM 响应缓存测试
+"""
+
+import pytest
+
+from creative_autogpt.storage.vector_store import MemoryType, SearchResult, VectorMemoryItem
+from creative_autogpt.utils import llm_cache as llm_cache_module
+from creative_autogpt.utils.llm_cache import LLMCache
+from creative_autogpt.utils.llm_client import (
+    LLMProvider,
+    LLMResponse,
+    LLMUsage,
+    MultiLLMClient,
+    ProviderTier,
+)
+
+
+def _response(content: str = "内容") -> LLMResponse:
+    return LLMResponse(
+        content=content,
+        model="fake",
+        provider=LLMProvider.DEEPSEEK,
+        usage=LLMUsage(prompt_tokens=1, completion_tokens=2, total_tokens=3),
+        tier=ProviderTier.REMOTE_STRONG,
+    )
+
+
+class _FakeClock:
+    """替换 llm_cache 模块中的 time，手动推进时间"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+class _StubVectorStore:
+    """语义层的假向量库：按 where 过滤，所有结果返回同一个距离"""
+
+    def __init__(self, distance: float = 0.0):
+        self.distance = distance
+        self.items = []
+        self.searches = 0
+
+    async def add(self, content, memory_type=MemoryType.GENERAL, metadata=None, **kwargs):
+        self.items.append(VectorMemoryItem(
+            id=str(len(self.items)), content=content, memory_type=memory_type, metadata=metadata or {},
+        ))
+        return self.items[-1].id
+
+    async def search(self, query, top_k=5, where=None, **kwargs):
+        self.searches += 1
+        conditions = where["$and"] if where else []
+        matches = [
+            item for item in self.items
+            if all(item.metadata.get(k) == v for condition in conditions for k, v in condition.items())
+        ]
+        return [SearchResult(item=item, score=0.0, distance=self.distance) for item in matches[:top_k]]
+
+
+class TestCacheKey:
+    """精确匹配键的推导"""
+
+    def test_same_request_same_key(self):
+        assert LLMCache.make_key("p", "大纲", 0.7, 100) == LLMCache.make_key("p", "大纲", 0.7, 100)
+
+    @pytest.mark.parametrize("other", [
+        ("q", "大纲", 0.7, 100),
+        ("p", "人物设计", 0.7, 100),
+        ("p", "大纲", 0.0, 100),
+        ("p", "大纲", 0.7, 200),
+    ])
+    def test_each_parameter_changes_key(self, other):
+        assert LLMCache.make_key("p", "大纲", 0.7, 100) != LLMCache.make_key(*other)
+
+    def test_extra_kwargs_are_order_independent(self):
+        assert LLMCache.make_key("p", None, 0, 1, top_p=0.9, llm="deepseek") == \
+            LLMCache.make_key("p", None, 0, 1, llm="deepseek", top_p=0.9)
+        assert LLMCache.make_key("p", None, 0, 1, top_p=0.9) != LLMCache.make_key("p", None, 0, 1)
+
+    def test_messages_part_of_key(self):
+        messages = [{"role": "user", "content": "hi"}]
+        assert LLMCache.make_key("p", None, 0, 1, messages) != LLMCache.make_key("p", None, 0, 1)
+
+
+class TestExactLayer:
+    """L1 精确匹配层：TTL 与 LRU 淘汰"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = _FakeClock()
+        monkeypatch.setattr(llm_cache_module, "time", clock)
+        return clock
+
+    @pytest.mark.asyncio
+    async def test_hit_marks_cached_l1(self, clock):
+        cache = LLMCache()
+        await cache.set("p", "大纲", 0, 100, _response("答案"))
+
+        hit = await cache.get("p", "大纲", 0, 100)
+
+        assert hit.content == "答案"
+        assert hit.cached is True
+        assert hit.tier == ProviderTier.CACHE_L1
+        assert cache.stats["exact_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self, clock):
+        cache = LLMCache(ttl=10)
+        await cache.set("p", "大纲", 0, 100, _response())
+
+        clock.now += 9
+        assert await cache.get("p", "大纲", 0, 100) is not None
+
+        clock.now += 1
+        assert await cache.get("p", "大纲", 0, 100) is None
+        assert cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_evicted(self, clock):
+        cache = LLMCache(max_entries=2)
+        await cache.set("a", None, 0, 1, _response("a"))
+        await cache.set("b", None, 0, 1, _response("b"))
+
+        # 读取 a 使其成为最近使用，随后写入 c 应淘汰 b
+        assert await cache.get("a", None, 0, 1) is not None
+        await cache.set("c", None, 0, 1, _response("c"))
+
+        assert await cache.get("a", None, 0, 1) is not None
+        assert await cache.get("b", None, 0, 1) is None
+        assert await cache.get("c", None, 0, 1) is not None
+
+
+class TestSemanticLayer:
+    """L2 语义层：阈值、零向量保护与适用范围"""
+
+    @pytest.mark.asyncio
+    async def test_similar_prompt_above_threshold_hits(self):
+        # 距离 0.08 → 余弦相似度 0.96
+        store = _StubVectorStore(distance=0.08)
+        cache = LLMCache(vector_store=store, semantic_threshold=0.95)
+        await cache.set("写一段开头", "章节内容", 0, 100, _response("开头"))
+
+        hit = await cache.get("写一个开头", "章节内容", 0, 100)
+
+        assert hit.content == "开头"
+        assert hit.tier == ProviderTier.CACHE_L2
+        assert cache.stats["semantic_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_similar_prompt_below_threshold_misses(self):
+        # 距离 0.2 → 余弦相似度 0.9
+        store = _StubVectorStore(distance=0.2)
+        cache = LLMCache(vector_store=store, semantic_threshold=0.95)
+        await cache.set("写一段开头", "章节内容", 0, 100, _response())
+
+        assert await cache.get("写一个开头", "章节内容", 0, 100) is None
+
+    @pytest.mark.asyncio
+    async def test_semantic_hit_requires_same_task_type_and_max_tokens(self):
+        store = _StubVectorStore(distance=0.0)
+        cache = LLMCache(vector_store=store)
+        await cache.set("p", "章节内容", 0, 100, _response())
+        cache.clear()
+
+        assert await cache.get("p", "大纲", 0, 100) is None
+        assert await cache.get("p", "章节内容", 0, 200) is None
+        assert await cache.get("p", "章节内容", 0, 100) is not None
+
+    @pytest.mark.asyncio
+    async def test_zero_distance_for_different_prompt_rejected(self):
+        """嵌入失败退化为零向量时，不同提示词的零距离不算命中"""
+        store = _StubVectorStore(distance=0.0)
+        cache = LLMCache(vector_store=store)
+        await cache.set("写一段开头", "章节内容", 0, 100, _response())
+
+        assert await cache.get("完全不同的提示词", "章节内容", 0, 100) is None
+
+    @pytest.mark.asyncio
+    async def test_sampled_requests_skip_semantic_layer_by_default(self):
+        store = _StubVectorStore(distance=0.0)
+        cache = LLMCache(vector_store=store)
+
+        await cache.set("p", "章节内容", 0.7, 100, _response())
+        assert store.items == []
+
+        cache.clear()
+        assert await cache.get("p", "章节内容", 0.7, 100) is None
+        assert store.searches == 0
+
+    @pytest.mark.asyncio
+    async def test_sampled_threshold_enables_semantic_layer(self):
+        store = _StubVectorStore(distance=0.08)
+        cache = LLMCache(vector_store=store, sampled_semantic_threshold=0.9)
+        await cache.set("写一段开头", "章节内容", 0.7, 100, _response("开头"))
+
+        hit = await cache.get("写一个开头", "章节内容", 0.7, 100)
+        assert hit.tier == ProviderTier.CACHE_L2
+
+    @pytest.mark.asyncio
+    async def test_messages_and_extra_params_skip_semantic_layer(self):
+        store = _StubVectorStore(distance=0.0)
+        cache = LLMCache(vector_store=store)
+        messages = [{"role": "user", "content": "p"}]
+
+        await cache.set("p", "章节内容", 0, 100, _response(), messages)
+        await cache.set("p", "章节内容", 0, 100, _response(), top_p=0.9)
+        assert store.items == []
+
+    @pytest.mark.asyncio
+    async def test_semantic_entry_expires_after_ttl(self, monkeypatch):
+        clock = _FakeClock()
+        monkeypatch.setattr(llm_cache_module, "time", clock)
+        store = _StubVectorStore(distance=0.0)
+        cache = LLMCache(vector_store=store, ttl=10)
+        await cache.set("p", "章节内容", 0, 100, _response())
+        cache.clear()
+
+        clock.now += 10
+        assert await cache.get("p", "章节内容", 0, 100) is None
+
+
+class _CountingProvider:
+    """每次调用返回新内容的假提供商"""
+
+    provider = LLMProvider.DEEPSEEK
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt, temperature=0.7, max_tokens=4000, messages=None, **kwargs):
+        self.calls += 1
+        return LLMResponse(
+            content=f"{prompt} #{self.calls}",
+            model="fake",
+            provider=self.provider,
+            usage=LLMUsage(prompt_tokens=1, completion_tokens=1, total_tokens=2),
+        )
+
+
+class TestMultiLLMClientCache:
+    """MultiLLMClient 与响应缓存的配合"""
+
+    @pytest.fixture
+    def provider(self):
+        return _CountingProvider()
+
+    @pytest.fixture
+    def client(self, provider):
+        return MultiLLMClient(providers=[provider], cache=LLMCache(), local_task_types=[])
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_served_from_cache(self, client, provider):
+        """相同请求第二次由 L1 缓存返回"""
+        first = await client.generate("写一章", task_type="章节内容", temperature=0)
+        second = await client.generate("写一章", task_type="章节内容", temperature=0)
+
+        assert provider.calls == 1
+        assert second.content == first.content
+        assert second.cached is True
+        assert second.tier == ProviderTier.CACHE_L1
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses_cache(self, client, provider):
+        """use_cache=False 既不读取也不写入缓存"""
+        await client.generate("写一章", task_type="章节内容", temperature=0)
+
+        fresh = await client.generate("写一章", task_type="章节内容", temperature=0, use_cache=False)
+        assert provider.calls == 2
+        assert fresh.cached is False
+
+        fresh_again = await client.generate("写一章", task_type="章节内容", temperature=0, use_cache=False)
+        assert provider.calls == 3
+        assert fresh_again.content != fresh.content